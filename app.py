@@ -1,49 +1,191 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
+from flask.json.provider import DefaultJSONProvider
 import requests
 import os
-import json
 import hmac
 import hashlib
 import time
 import base64  # base64 import 추가!
+import ssl
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import atexit
 import threading
-from typing import Dict, Optional, Tuple
+import queue
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlencode
+import concurrent.futures
+import functools
+import itertools
+import math
+import collections
+import orjson
 import pickle
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON 직렬화/파싱을 orjson으로 처리 (orjson이 모르는 타입은 Flask 기본 변환 사용)
+
+    라우트 응답은 _json()으로 만들고, 이 provider는 request.get_json() 등 Flask 내부 JSON 처리에 사용됩니다.
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS  # 표준 json과 같이 int 등 문자열이 아닌 dict 키도 허용
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        """request.get_json() 등 본문 파싱 (str/bytes 모두 허용)"""
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('trading.log'),
-        logging.StreamHandler()
-    ]
-)
+# 호출 스레드는 큐에 레코드만 넣고, 파일/콘솔 쓰기는 QueueListener 스레드가 처리
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    RotatingFileHandler('trading.log', maxBytes=10 * 1024 * 1024, backupCount=5, delay=True),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+log_queue = queue.Queue(-1)
+_queue_handler = QueueHandler(log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # 최종 포맷은 리스너 쪽 핸들러가 적용
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+log_listener = QueueListener(log_queue, *_log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # 환경 변수 설정
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID', 'YOUR_CHAT_ID_HERE')
+TELEGRAM_API_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
+TELEGRAM_SEND_URL = f"{TELEGRAM_API_URL}/sendMessage"
+TELEGRAM_UPDATES_URL = f"{TELEGRAM_API_URL}/getUpdates"
+TELEGRAM_STATIC = {'chat_id': TELEGRAM_CHAT_ID, 'parse_mode': 'HTML'}  # sendMessage 고정 필드
+# 토큰/채팅 ID가 기본값이면 텔레그램 비활성 (알림 문구 생성·전송, 봇 폴링 모두 생략)
+TELEGRAM_ENABLED = TELEGRAM_BOT_TOKEN != 'YOUR_BOT_TOKEN_HERE' and TELEGRAM_CHAT_ID != 'YOUR_CHAT_ID_HERE'
+# 웹훅 모드: TELEGRAM_WEBHOOK_URL(예: https://앱주소/telegram)과 TELEGRAM_WEBHOOK_SECRET을 함께 설정하면 폴링 대신 텔레그램이 /telegram으로 명령을 전송
+TELEGRAM_WEBHOOK_URL = os.environ.get('TELEGRAM_WEBHOOK_URL', '')
+TELEGRAM_WEBHOOK_SECRET = os.environ.get('TELEGRAM_WEBHOOK_SECRET', '')  # X-Telegram-Bot-Api-Secret-Token 검증용 (웹훅 모드 필수)
+TELEGRAM_WEBHOOK_MODE = bool(TELEGRAM_WEBHOOK_URL and TELEGRAM_WEBHOOK_SECRET)  # 시크릿 없이는 웹훅 모드를 켜지 않음
 
 # Bitget API 설정
 BITGET_API_KEY = os.environ.get('BITGET_API_KEY', 'YOUR_API_KEY_HERE')
 BITGET_SECRET_KEY = os.environ.get('BITGET_SECRET_KEY', 'YOUR_SECRET_KEY_HERE')
 BITGET_PASSPHRASE = os.environ.get('BITGET_PASSPHRASE', 'YOUR_PASSPHRASE_HERE')
 BITGET_BASE_URL = "https://api.bitget.com"
+BITGET_TIME_URL = f"{BITGET_BASE_URL}/api/mix/v1/market/time"  # 공개 API (서명 불필요)
+BALANCE_FALLBACK_SYMBOL = 'BTCUSDT_UMCBL'  # 계좌 목록 조회가 비었을 때 단일 계좌 조회에 쓰는 심볼
 
 # 거래 설정
 LOSS_RATIO = float(os.environ.get('LOSS_RATIO', '15'))  # 손실 비율 (%)
 MAX_LEVERAGE = 30  # 최대 레버리지
-STATS_FILE = 'trading_stats.pkl'  # 통계 파일
+TRADES_FILE = 'trades.jsonl'  # 거래 내역 (append-only JSON lines)
+STATS_COUNTERS_FILE = 'stats_counters.json'  # 통계 카운터 (os.replace로 원자적 교체)
+LEGACY_STATS_FILE = 'trading_stats.pkl'  # 이전 버전 pickle 통계 - 카운터 파일이 없을 때 한 번만 가져옴
+TRADES_HISTORY_LIMIT = 1000  # 메모리에 유지하는 최근 거래 수 (오래된 거래는 파일에만 남음)
+BALANCE_CACHE_TTL = 3  # 잔고 조회 재사용 시간 (초) - 연속 신호 시 API 호출 절약
+TEST_BALANCE_CACHE_TTL = 10  # /test (업타임 모니터 호출) 잔고 재사용 시간 (초)
+POSITIONS_CACHE_TTL = 3  # /S, /M 상태 명령의 포지션 조회 재사용 시간 (초) - 거래 판단에는 사용하지 않음
+POSITION_STATE_FILE = 'position_state.json'  # 프로세스 재시작 후 current_position 복원용 (os.replace로 원자적 교체)
+# ⚠️ Heroku 등 dyno 파일시스템은 휘발성 - dyno 재시작/배포 시 파일이 사라지므로 복원되지 않음 (보유 여부는 항상 API 기준)
+
+# HTTP 세션 (keep-alive 커넥션 풀 재사용 → 호출마다 TCP/TLS 핸드셰이크 생략)
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    return session
+
+BITGET_SESSION = _create_session()
+BITGET_SESSION.headers.update({'Content-Type': 'application/json', 'locale': 'en-US'})  # 요청 공통 헤더
+TELEGRAM_SESSION = _create_session()
+TELEGRAM_SESSION.headers.update({'Content-Type': 'application/json'})  # sendMessage는 orjson JSON 본문으로 전송
+TELEGRAM_SEND_TIMEOUT = (3, 10)  # (연결, 응답) 초 - 연결 불가 시 알림 워커가 오래 묶이지 않도록 연결 대기를 짧게
+# 종료 시 남은 알림 전송 제한 - gunicorn graceful_timeout(기본 30초) 안에 끝나도록 전체 시간과 건별 대기를 짧게
+TELEGRAM_DRAIN_TIMEOUT = 8  # 전체 전송 시간 (초)
+TELEGRAM_DRAIN_SEND_TIMEOUT = (1, 2)  # 건별 (연결, 응답) 초 (어댑터 재시도 포함 시 건당 최대 약 9초)
+
+# 서로 독립적인 Bitget 조회를 동시에 보내기 위한 I/O 스레드 풀
+io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+_position_file_lock = threading.Lock()
+
+def _save_position():
+    """current_position을 파일에 기록 (포지션이 없으면 파일 삭제) - position_lock 밖에서 호출
+
+    기록 시점의 current_position을 저장하므로 여러 워커의 저장 순서가 뒤바뀌어도 파일은 최신 상태가 됩니다.
+    """
+    with _position_file_lock:
+        _write_position(current_position)
+
+def _write_position(position: Optional[Dict]):
+    """POSITION_STATE_FILE 원자적 교체 (tmp 파일 + os.replace)"""
+    try:
+        if position is None:
+            if os.path.exists(POSITION_STATE_FILE):
+                os.remove(POSITION_STATE_FILE)
+            return
+        tmp_file = POSITION_STATE_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(position))
+        os.replace(tmp_file, POSITION_STATE_FILE)
+    except Exception as e:
+        logger.error("포지션 상태 저장 실패: %s", e)
 
-# 현재 활성 포지션 (메모리에 저장)
+def _load_position() -> Optional[Dict]:
+    """재시작 시 마지막 포지션 상태 복원 - 재시작 중 거래소에서 청산됐을 수 있으므로 미확인 표시"""
+    try:
+        if os.path.exists(POSITION_STATE_FILE):
+            with open(POSITION_STATE_FILE, 'rb') as f:
+                position = orjson.loads(f.read())
+            position['unconfirmed'] = True
+            return position
+    except Exception as e:
+        logger.error("포지션 상태 로드 실패: %s", e)
+    return None
+
+# 현재 활성 포지션 (메모리 + POSITION_STATE_FILE에 저장)
 # ⚠️ 공지: 더 이상 포지션 보유 여부를 메모리로 '확인'하지 않습니다. (API로만 확인)
-current_position = None
-position_lock = threading.Lock()
+current_position = _load_position()
+# position_lock은 current_position / pending_symbols 갱신 구간만 보호합니다 (네트워크 I/O 중에는 잡지 않음)
+position_lock = threading.RLock()
+pending_symbols = set()  # 진입 처리 중인 심볼 (같은 심볼 중복 신호 차단)
+
+class _LegacyStats:
+    """이전 버전 TradingStats pickle의 속성만 담는 빈 객체"""
+
+# 기본 프로토콜(4)은 datetime만 필요, 낮은 프로토콜(0~2) 파일은 copyreg/_codecs 헬퍼도 사용
+_LEGACY_PICKLE_TYPES = {
+    ('datetime', 'datetime'),
+    ('copyreg', '_reconstructor'), ('copy_reg', '_reconstructor'),
+    ('builtins', 'object'), ('__builtin__', 'object'),
+    ('_codecs', 'encode'),
+}
+
+class _LegacyStatsUnpickler(pickle.Unpickler):
+    """trading_stats.pkl 전용 - 이전 TradingStats 인스턴스와 datetime 외의 타입은 거부"""
+    
+    def find_class(self, module, name):
+        if name == 'TradingStats':
+            return _LegacyStats
+        if (module, name) in _LEGACY_PICKLE_TYPES:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"허용되지 않은 타입: {module}.{name}")
 
 # 거래 통계
 class TradingStats:
@@ -52,129 +194,287 @@ class TradingStats:
         self.losses = 0
         self.total_trades = 0
         self.start_date = datetime.now()
-        self.trades_history = []
+        self.trades_history = collections.deque(maxlen=TRADES_HISTORY_LIMIT)  # 오래된 거래는 O(1)로 자동 제거
+        self._unsaved_trades = []  # 아직 TRADES_FILE에 기록되지 않은 거래
+        self._truncate_trades = False  # reset 이후 첫 저장 시 거래 파일 비우기
+        self._refresh_caches()  # 조회용 캐시 (거래 추가/초기화 시에만 갱신)
+        self._lock = threading.Lock()  # 미저장 버퍼/카운터 스냅샷 보호
+        self._flush_lock = threading.Lock()  # 파일 쓰기 직렬화 (플러셔 스레드 / atexit)
+        self._dirty = threading.Event()  # 저장할 변경이 있음
     
     def add_trade(self, result: str, profit_rate: float, symbol: str):
-        self.total_trades += 1
-        if result == 'WIN':
-            self.wins += 1
-        else:
-            self.losses += 1
-        
-        self.trades_history.append({
+        trade = {
             'timestamp': datetime.now(),
             'symbol': symbol,
             'result': result,
             'profit_rate': profit_rate
-        })
+        }
+        with self._lock:
+            self.total_trades += 1
+            if result == 'WIN':
+                self.wins += 1
+            else:
+                self.losses += 1
+            
+            self.trades_history.append(trade)
+            self._unsaved_trades.append(trade)
+            self._refresh_caches()
+        self._dirty.set()
+    
+    def _build_recent_text(self) -> str:
+        """최근 거래 5개 텔레그램 표시 문자열"""
+        recent_trades = ""
+        for trade in itertools.islice(reversed(self.trades_history), 5):
+            emoji = "✅" if trade['result'] == 'WIN' else "❌"
+            recent_trades += f"\n{emoji} {trade['symbol']}: {trade['profit_rate']:+.2f}%"
+        return recent_trades or "\n최근 거래 없음"
+    
+    def _refresh_caches(self):
+        self._win_rate = (self.wins / self.total_trades) * 100 if self.total_trades else 0
+        self._recent_cache = self._build_recent_text()
+        self._summary_json = orjson.dumps({'wins': self.wins, 'losses': self.losses, 'win_rate': self._win_rate})
     
     def get_win_rate(self):
-        if self.total_trades == 0:
-            return 0
-        return (self.wins / self.total_trades) * 100
+        return self._win_rate
+    
+    def get_recent_trades_text(self) -> str:
+        return self._recent_cache
+    
+    def get_summary_json(self) -> bytes:
+        """헬스 체크용 통계 요약 JSON (거래 추가/초기화 시에만 갱신)"""
+        return self._summary_json
     
     def reset(self):
-        self.wins = 0
-        self.losses = 0
-        self.total_trades = 0
-        self.start_date = datetime.now()
-        self.trades_history = []
+        with self._lock:
+            self.wins = 0
+            self.losses = 0
+            self.total_trades = 0
+            self.start_date = datetime.now()
+            self.trades_history.clear()
+            self._unsaved_trades = []
+            self._truncate_trades = True
+            self._refresh_caches()
+        self._dirty.set()
     
-    def save(self):
-        try:
-            with open(STATS_FILE, 'wb') as f:
-                pickle.dump(self, f)
-        except Exception as e:
-            logger.error(f"통계 저장 실패: {str(e)}")
+    def _flush(self):
+        """새 거래만 TRADES_FILE에 추가하고 카운터 파일은 원자적으로 교체 (이력 길이와 무관하게 O(1))"""
+        with self._flush_lock:
+            with self._lock:
+                trades, self._unsaved_trades = self._unsaved_trades, []
+                truncate, self._truncate_trades = self._truncate_trades, False
+                counters = {
+                    'wins': self.wins,
+                    'losses': self.losses,
+                    'total_trades': self.total_trades,
+                    'start_date': self.start_date
+                }
+            
+            try:
+                if trades or truncate:
+                    with open(TRADES_FILE, 'wb' if truncate else 'ab') as f:
+                        for trade in trades:
+                            f.write(orjson.dumps(trade) + b'\n')
+                
+                tmp_file = STATS_COUNTERS_FILE + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(counters))
+                os.replace(tmp_file, STATS_COUNTERS_FILE)
+            except Exception as e:
+                logger.error("통계 저장 실패: %s", e)
+                # 기록하지 못한 거래는 다음 플러시에서 다시 시도
+                with self._lock:
+                    self._unsaved_trades[:0] = trades
+                    self._truncate_trades = self._truncate_trades or truncate
+                self._dirty.set()
+    
+    def flush_pending(self):
+        """저장하지 않은 변경이 있을 때만 기록 (종료 시 호출 - 변경 없으면 파일을 만들지 않음)"""
+        with self._lock:
+            pending = self._dirty.is_set() or bool(self._unsaved_trades) or self._truncate_trades
+        if pending:
+            self._flush()
+    
+    def run_flusher(self):
+        """변경이 있을 때만 디스크에 기록하는 백그라운드 루프 (거래 경로에서 디스크 I/O 제거)"""
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            self._flush()
+            time.sleep(2)
+    
+    def _import_legacy(self):
+        """이전 버전 trading_stats.pkl의 통계를 가져와 새 파일 형식으로 저장 예약"""
+        with open(LEGACY_STATS_FILE, 'rb') as f:
+            legacy = vars(_LegacyStatsUnpickler(f).load())
+        history = [trade for trade in legacy.get('trades_history', []) if isinstance(trade, dict)]
+        self.wins = legacy.get('wins', 0)
+        self.losses = legacy.get('losses', 0)
+        self.total_trades = legacy.get('total_trades', 0)
+        self.start_date = legacy.get('start_date') or self.start_date
+        self.trades_history.extend(history)
+        # 전체 이력을 TRADES_FILE에 새로 쓰고 카운터 파일 생성 (이후 시작부터는 카운터 파일 사용)
+        self._unsaved_trades = history
+        self._truncate_trades = True
+        self._dirty.set()
+        logger.warning(
+            "이전 통계 파일(%s) 가져옴: 익절 %s회, 손절 %s회, 거래 %s건",
+            LEGACY_STATS_FILE, self.wins, self.losses, len(history)
+        )
     
     @classmethod
     def load(cls):
         try:
-            if os.path.exists(STATS_FILE):
-                with open(STATS_FILE, 'rb') as f:
-                    return pickle.load(f)
+            loaded = cls()
+            if os.path.exists(STATS_COUNTERS_FILE):
+                with open(STATS_COUNTERS_FILE, 'rb') as f:
+                    counters = orjson.loads(f.read())
+                loaded.wins = counters['wins']
+                loaded.losses = counters['losses']
+                loaded.total_trades = counters['total_trades']
+                loaded.start_date = datetime.fromisoformat(counters['start_date'])
+            elif os.path.exists(LEGACY_STATS_FILE):
+                loaded._import_legacy()
+                loaded._refresh_caches()
+                return loaded
+            
+            if os.path.exists(TRADES_FILE):
+                # 최근 TRADES_HISTORY_LIMIT개 라인만 메모리에 유지
+                with open(TRADES_FILE, 'rb') as f:
+                    recent_lines = collections.deque(f, maxlen=TRADES_HISTORY_LIMIT)
+                for line in recent_lines:
+                    try:
+                        trade = orjson.loads(line)
+                        trade['timestamp'] = datetime.fromisoformat(trade['timestamp'])
+                    except (orjson.JSONDecodeError, KeyError, ValueError):
+                        # 기록 도중 중단된 마지막 라인 등은 건너뜀
+                        continue
+                    loaded.trades_history.append(trade)
+            loaded._refresh_caches()
+            return loaded
         except Exception as e:
-            logger.error(f"통계 로드 실패: {str(e)}")
+            logger.error("통계 로드 실패: %s", e)
         return cls()
 
 # 통계 객체 초기화
 stats = TradingStats.load()
+atexit.register(stats.flush_pending)  # 종료 시 남은 변경 기록
+
+@functools.lru_cache(maxsize=256)
+def _to_umcbl(symbol: str) -> str:
+    """심볼 형식 변환: ETHUSDT → ETHUSDT_UMCBL (이미 변환된 심볼은 그대로)"""
+    return symbol[:-4] + 'USDT_UMCBL' if symbol.endswith('USDT') else symbol
+
+class UsdtBalance(NamedTuple):
+    """USDT 선물 계좌 잔고"""
+    available: float
+    cross_max: float
+    equity: float
+    frozen: float
+    unrealized_pnl: float
+    
+    @property
+    def usable(self) -> float:
+        """주문에 사용할 잔고 (available → crossMaxAvailable → usdtEquity 순)"""
+        return self.available or self.cross_max or self.equity
+
+def _parse_usdt_account(accounts: Union[list, Dict]) -> Optional[UsdtBalance]:
+    """/account/accounts 응답에서 USDT 계좌 추출"""
+    if isinstance(accounts, dict):
+        accounts = [accounts]
+    for acc in accounts:
+        if acc.get('marginCoin') == 'USDT':
+            return UsdtBalance(
+                available=float(acc.get('available') or 0),
+                cross_max=float(acc.get('crossMaxAvailable') or 0),
+                equity=float(acc.get('usdtEquity') or 0),
+                frozen=float(acc.get('frozen') or 0),
+                unrealized_pnl=float(acc.get('unrealizedPL') or 0),
+            )
+    return None
+
+# 서명에 쓰는 HTTP 메서드 bytes (요청마다 인코딩하지 않도록 미리 생성)
+_METHOD_BYTES = {'GET': b'GET', 'POST': b'POST'}
 
 class BitgetFuturesClient:
     """Bitget 선물 API 클라이언트"""
     
-    def __init__(self):
+    def __init__(self, session: requests.Session = BITGET_SESSION):
         self.api_key = BITGET_API_KEY
         self.secret_key = BITGET_SECRET_KEY
         self.passphrase = BITGET_PASSPHRASE
+        self._secret_bytes = self.secret_key.encode('utf-8')
+        # 키 패딩(ipad/opad)까지 처리된 HMAC 상태를 한 번만 만들고 요청마다 copy()
+        self._hmac_template = hmac.new(self._secret_bytes, digestmod=hashlib.sha256)
         self.base_url = BITGET_BASE_URL
+        self.session = session
+        # 요청마다 바뀌지 않는 인증 헤더는 한 번만 만들어 두고 서명 요청에만 병합
+        # (공유 세션에 넣으면 서버 시간 조회 등 공개 API 호출에도 키가 전송됨)
+        self._auth_headers = {'ACCESS-KEY': self.api_key, 'ACCESS-PASSPHRASE': self.passphrase}
+        self._balance_cache = None  # (잔고, time.monotonic() 조회 시각) - 튜플 교체라 락 불필요
+        self._positions_cache = {}  # 심볼(None=전체) -> (포지션 목록, time.monotonic() 조회 시각)
     
-    def _generate_signature(self, timestamp: str, method: str, request_path: str, body: str = '') -> str:
+    def _generate_signature(self, timestamp: str, method: str, request_path: str, body: bytes = b'') -> bytes:
         """API 서명 생성 - Bitget 공식 문서 기준"""
         # GET 요청에서 쿼리 파라미터가 있는 경우 request_path에 포함되어야 함
-        message = timestamp + method.upper() + request_path + body
+        # body는 전송할 bytes 그대로 서명 (재인코딩 없음)
+        # HMAC SHA256 서명 생성 (키 유도는 __init__에서 한 번만 수행)
+        # 서명 대상 문자열을 합치지 않고 각 부분을 순서대로 update (중간 bytes 객체 생성 없음)
+        mac = self._hmac_template.copy()
+        mac.update(timestamp.encode())
+        mac.update(_METHOD_BYTES[method])
+        mac.update(request_path.encode())
+        mac.update(body)
         
-        # HMAC SHA256 서명 생성
-        mac = hmac.new(
-            bytes(self.secret_key, encoding='utf-8'),
-            bytes(message, encoding='utf-8'),
-            digestmod='sha256'
-        )
-        
-        # Base64 인코딩
-        signature = base64.b64encode(mac.digest()).decode()
-        return signature
+        # Base64 인코딩 (requests는 bytes 헤더 값을 그대로 전송하므로 str 변환 생략)
+        return base64.b64encode(mac.digest())
     
     def _make_request(self, method: str, endpoint: str, data: Dict = None, version: str = 'v1') -> Dict:
         """API 요청 실행 (mix v1/v2 지원)"""
         try:
-            timestamp = str(int(time.time() * 1000))
+            method = method.upper()
+            if method not in _METHOD_BYTES:
+                raise ValueError(f"Unsupported method: {method}")
+            
+            timestamp = str(time.time_ns() // 1_000_000)
             request_path = f"/api/mix/{version}{endpoint}"
             
-            # GET 요청의 경우 쿼리 파라미터를 URL에 추가
-            if method.upper() == 'GET' and data:
-                params = '&'.join([f"{k}={v}" for k, v in data.items()])
-                full_path = f"{request_path}?{params}"
-                body = ''
+            # GET 요청의 경우 쿼리 파라미터를 URL에 추가 (서명 대상 경로와 실제 요청 URL이 동일해야 함)
+            if method == 'GET' and data:
+                full_path = f"{request_path}?{urlencode(data)}"
+                body = b''
             else:
                 full_path = request_path
-                body = json.dumps(data) if data else ''
+                body = orjson.dumps(data) if data else b''
             
-            signature = self._generate_signature(timestamp, method.upper(), full_path, body)
+            signature = self._generate_signature(timestamp, method, full_path, body)
             
             headers = {
-                'ACCESS-KEY': self.api_key,
+                **self._auth_headers,
                 'ACCESS-SIGN': signature,
-                'ACCESS-TIMESTAMP': timestamp,
-                'ACCESS-PASSPHRASE': self.passphrase,
-                'Content-Type': 'application/json',
-                'locale': 'en-US'
+                'ACCESS-TIMESTAMP': timestamp
             }
             
             url = self.base_url + full_path
             
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method.upper() == 'POST':
-                response = requests.post(url, headers=headers, data=body, timeout=10)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            response = self.session.request(method, url, headers=headers, data=body or None, timeout=10)
             
             if response.status_code != 200:
-                logger.error(f"HTTP Error {response.status_code}: {response.text}")
+                logger.error("HTTP Error %s: %s", response.status_code, response.text)
                 raise Exception(f"HTTP Error {response.status_code}")
             
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if result.get('code') != '00000':
                 error_msg = result.get('msg', 'Unknown error')
-                logger.error(f"API Error: {error_msg}, Full response: {result}")
+                logger.error("API Error: %s, Full response: %s", error_msg, result)
                 raise Exception(f"API Error: {error_msg}")
             
-            return result.get('data', {})
+            # 성공 경로에서 기본값 dict를 매번 만들지 않도록 None일 때만 빈 dict 반환
+            data = result.get('data')
+            return {} if data is None else data
             
         except Exception as e:
-            logger.error(f"Bitget API 요청 실패: {str(e)}")
+            logger.error("Bitget API 요청 실패: %s", e)
             raise
 
     # =========================
@@ -189,7 +489,7 @@ class BitgetFuturesClient:
         :param hold_side: 포지션 방향 (long / short) - 헷지 모드용
         """
         # ✅ 심볼 형식 변환: ETHUSDT → ETHUSDT_UMCBL
-        formatted_symbol = symbol.replace('USDT', 'USDT_UMCBL')
+        formatted_symbol = _to_umcbl(symbol)
         
         payload = {
             "symbol": formatted_symbol,
@@ -201,10 +501,10 @@ class BitgetFuturesClient:
         try:
             # ✅ endpoint만 전달 (url 전체 X)
             response = self._make_request("POST", "/account/setLeverage", payload, version="v1")
-            logging.info(f"레버리지 설정 성공: {response}")
+            logger.info("레버리지 설정 성공: %s", response)
             return response
         except Exception as e:
-            logging.error(f"레버리지 설정 실패: {e}")
+            logger.error("레버리지 설정 실패: %s", e)
             return None
     
 
@@ -214,7 +514,7 @@ class BitgetFuturesClient:
         """계좌 정보 조회"""
         try:
             # BTCUSDT -> BTCUSDT_UMCBL 형식으로 변환
-            formatted_symbol = symbol.replace('USDT', 'USDT_UMCBL')
+            formatted_symbol = _to_umcbl(symbol)
             
             result = self._make_request('GET', '/account/account', {
                 'symbol': formatted_symbol,
@@ -223,60 +523,81 @@ class BitgetFuturesClient:
             return result
             
         except Exception as e:
-            logger.error(f"계좌 정보 조회 실패: {str(e)}")
+            logger.error("계좌 정보 조회 실패: %s", e)
             return {}
     
-    def get_available_balance(self) -> float:
-        """사용 가능한 USDT 잔고 조회"""
+    def get_usdt_balance(self) -> Optional['UsdtBalance']:
+        """USDT 선물 계좌 잔고 상세 조회 (API 오류는 호출자에게 전달)"""
+        result = self._make_request('GET', '/account/accounts', {
+            'productType': 'umcbl'
+        })
+        return _parse_usdt_account(result) if result else None
+    
+    def _fetch_available_balance(self) -> float:
+        """사용 가능한 USDT 잔고 API 조회 (계좌 목록 API 오류는 호출자에게 전달)"""
+        result = self._make_request('GET', '/account/accounts', {
+            'productType': 'umcbl'
+        })
+        
+        if result:
+            usdt = _parse_usdt_account(result)
+            return usdt.usable if usdt else 0.0
+        
+        # 계좌 목록이 비어 있을 때만 단일 계좌 API로 재조회
         try:
-            result = self._make_request('GET', '/account/accounts', {
-                'productType': 'umcbl'
+            account_info = self._make_request('GET', '/account/account', {
+                'symbol': BALANCE_FALLBACK_SYMBOL,
+                'marginCoin': 'USDT'
             })
-            
-            if isinstance(result, list):
-                for account in result:
-                    if account.get('marginCoin') == 'USDT':
-                        available = account.get('available') or account.get('crossMaxAvailable') or account.get('usdtEquity')
-                        if available:
-                            return float(available)
-            elif isinstance(result, dict):
-                if result.get('marginCoin') == 'USDT':
-                    available = result.get('available') or result.get('crossMaxAvailable') or result.get('usdtEquity')
-                    if available:
-                        return float(available)
-            
-            try:
-                account_info = self._make_request('GET', '/account/account', {
-                    'symbol': 'BTCUSDT_UMCBL',
-                    'marginCoin': 'USDT'
-                })
-                if account_info:
-                    available = account_info.get('crossMaxAvailable') or account_info.get('available')
-                    if available:
-                        return float(available)
-            except:
-                pass
-            
-            return 0.0
-            
+            if account_info:
+                available = account_info.get('crossMaxAvailable') or account_info.get('available')
+                if available:
+                    return float(available)
+        except:
+            pass
+        
+        return 0.0
+    
+    def get_available_balance(self, max_age: float = BALANCE_CACHE_TTL) -> float:
+        """사용 가능한 USDT 잔고 조회 (max_age초 이내에 조회한 값은 재사용, 0이면 항상 새로 조회)"""
+        cached = self._balance_cache
+        if cached is not None and time.monotonic() - cached[1] < max_age:
+            return cached[0]
+        
+        try:
+            balance = self._fetch_available_balance()
         except Exception as e:
-            logger.error(f"잔고 조회 실패: {str(e)}")
+            logger.error("잔고 조회 실패: %s", e)
             return 0.0
+        
+        self._balance_cache = (balance, time.monotonic())
+        return balance
+    
+    def invalidate_cache(self):
+        """주문/청산 후 잔고·포지션 캐시 무효화"""
+        self._balance_cache = None
+        self._positions_cache = {}
     
-    def get_positions(self, symbol: str = None) -> list:
+    def get_positions(self, symbol: str = None, max_age: float = 0) -> list:
         """현재 포지션 조회 (v1 엔드포인트 유지)
         ※ 보유 여부 확인은 반드시 이 API 결과로만 판단합니다.
+        거래 경로는 기본값(max_age=0)으로 항상 새로 조회하고, 상태 명령만 max_age를 지정해 캐시를 사용합니다.
         """
+        cached = self._positions_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[1] < max_age:
+            return cached[0]
+        
         try:
             params = {'productType': 'umcbl'}
             if symbol:
-                params['symbol'] = symbol.replace('USDT', 'USDT_UMCBL')
+                params['symbol'] = _to_umcbl(symbol)
             
             result = self._make_request('GET', '/position/allPosition', params)
+            self._positions_cache[symbol] = (result, time.monotonic())
             return result
             
         except Exception as e:
-            logger.error(f"포지션 조회 실패: {str(e)}")
+            logger.error("포지션 조회 실패: %s", e)
             return []
     
     def place_limit_order(self, symbol: str, side: str, size: float, price: float, 
@@ -285,7 +606,7 @@ class BitgetFuturesClient:
         ⚠️ 레버리지 적용은 사전에 set_leverage()로 강제 설정됩니다.
         """
         try:
-            formatted_symbol = symbol.replace('USDT', 'USDT_UMCBL')
+            formatted_symbol = _to_umcbl(symbol)
             
             price = round(price, 2)
             if tp_price:
@@ -312,13 +633,13 @@ class BitgetFuturesClient:
             return result.get('orderId')
             
         except Exception as e:
-            logger.error(f"주문 실행 실패: {str(e)}")
+            logger.error("주문 실행 실패: %s", e)
             return None
     
     def close_all_positions(self, symbol: str) -> bool:
         """모든 포지션 종료"""
         try:
-            formatted_symbol = symbol.replace('USDT', 'USDT_UMCBL')
+            formatted_symbol = _to_umcbl(symbol)
             
             data = {
                 'symbol': formatted_symbol,
@@ -330,26 +651,75 @@ class BitgetFuturesClient:
             return True
             
         except Exception as e:
-            logger.error(f"포지션 종료 실패: {str(e)}")
+            logger.error("포지션 종료 실패: %s", e)
             return False
 
-def send_telegram_message(message: str) -> bool:
-    """텔레그램으로 메시지 전송"""
+# 프로세스 전체에서 공유하는 Bitget 클라이언트 (커넥션 풀/서명 키 재사용)
+bitget_client = BitgetFuturesClient(BITGET_SESSION)
+
+# 텔레그램 알림 큐 (거래 경로가 텔레그램 응답을 기다리지 않도록 백그라운드 워커가 전송)
+telegram_queue = queue.Queue(maxsize=1024)
+
+def send_telegram_message_sync(message: str, timeout=TELEGRAM_SEND_TIMEOUT) -> bool:
+    """텔레그램으로 메시지 즉시 전송 (실제 HTTP 호출) - 전송 결과가 필요한 경우에만 직접 사용"""
+    if not TELEGRAM_ENABLED:
+        return False
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        data = {
-            'chat_id': TELEGRAM_CHAT_ID,
-            'text': message,
-            'parse_mode': 'HTML'
-        }
-        
-        response = requests.post(url, data=data, timeout=10)
+        body = orjson.dumps({**TELEGRAM_STATIC, 'text': message})
+        response = TELEGRAM_SESSION.post(TELEGRAM_SEND_URL, data=body, timeout=timeout)
         return response.status_code == 200
         
     except Exception as e:
-        logger.error(f"텔레그램 전송 오류: {str(e)}")
+        logger.error("텔레그램 전송 오류: %s", e)
+        return False
+
+def send_telegram_message(message: Union[str, Callable[[], str]]) -> bool:
+    """텔레그램 메시지 전송 예약 (큐가 가득 차면 거래를 막지 않도록 버림)
+    
+    message에 callable을 넘기면 문자열 포맷팅을 텔레그램 워커 스레드에서 수행합니다.
+    텔레그램이 비활성이면 큐에 넣지 않으므로 callable 메시지는 포맷팅되지 않습니다.
+    """
+    if not TELEGRAM_ENABLED:
+        return False
+    try:
+        telegram_queue.put_nowait(message)
+        return True
+    except queue.Full:
+        logger.warning("텔레그램 큐가 가득 차 메시지를 버립니다")
         return False
 
+def _deliver_telegram(message: Union[str, Callable[[], str]], timeout=TELEGRAM_SEND_TIMEOUT) -> bool:
+    """큐에서 꺼낸 메시지를 (필요하면 포맷팅 후) 전송"""
+    if callable(message):
+        try:
+            message = message()
+        except Exception as e:
+            logger.error("텔레그램 메시지 생성 오류: %s", e)
+            return False
+    return send_telegram_message_sync(message, timeout)
+
+def _telegram_worker():
+    """텔레그램 큐 전송 워커"""
+    while True:
+        _deliver_telegram(telegram_queue.get())
+
+def _drain_telegram_queue():
+    """종료 시 큐에 남은 알림 전송 (청산/오류 알림 유실 방지)
+
+    텔레그램에 연결할 수 없으면 워커 종료가 멈추지 않도록 TELEGRAM_DRAIN_TIMEOUT이 지나거나 전송이 한 번 실패하면 중단합니다.
+    """
+    deadline = time.monotonic() + TELEGRAM_DRAIN_TIMEOUT
+    while True:
+        try:
+            message = telegram_queue.get_nowait()
+        except queue.Empty:
+            return
+        if time.monotonic() >= deadline or not _deliver_telegram(message, TELEGRAM_DRAIN_SEND_TIMEOUT):
+            logger.error("종료 시 텔레그램 알림 전송 중단 - 미전송 %s건", telegram_queue.qsize() + 1)
+            return
+
+atexit.register(_drain_telegram_queue)
+
 def calculate_leverage(entry_price: float, sl_price: float) -> int:
     """레버리지 계산"""
     risk_percent = abs((entry_price - sl_price) / entry_price) * 100
@@ -362,214 +732,47 @@ def calculate_position_size(balance: float, leverage: int) -> float:
     """포지션 크기 계산 (100% 사용)"""
     return balance * leverage
 
-def execute_entry_trade(data: Dict) -> Dict:
-    """진입 거래 실행"""
-    global current_position
-    
-    try:
-        with position_lock:
-            bitget = BitgetFuturesClient()
-            
-            # ✅ 핵심 변경 2: 메모리(current_position)로 보유 여부 체크 제거
-            #    무조건 API로만 확인
-            symbol = data.get('symbol', '')
-            positions = bitget.get_positions(symbol)
-            if positions and len(positions) > 0:
-                message = "⚠️ Bitget에 이미 열린 포지션이 있습니다. 신호를 무시합니다."
-                send_telegram_message(message)
-                return {'status': 'ignored', 'reason': 'position_exists_on_exchange'}
-            
-            # 거래 파라미터 - 가격 정밀도 처리
-            entry_price = round(float(data.get('price', 0)), 2)
-            tp_price = round(float(data.get('tp', 0)), 2)
-            sl_price = round(float(data.get('sl', 0)), 2)
-            
-            # 레버리지 계산
-            leverage = calculate_leverage(entry_price, sl_price)
-            
-            # 레버리지가 31 이상이면 거래 중단 (상한 체크는 내부 정책)
-            if leverage > MAX_LEVERAGE:
-                message = f"""❌ <b>거래 범위가 너무 작습니다</b>
+# 텔레그램 메시지 템플릿
+_REJECT_LEVERAGE_TEMPLATE = """❌ <b>거래 범위가 너무 작습니다</b>
 
 📈 심볼: {symbol}
 📊 계산된 레버리지: {leverage}x
-⚠️ 최대 허용 레버리지: {MAX_LEVERAGE}x
+⚠️ 최대 허용 레버리지: {max_leverage}x
 
 거래 범위가 작아서 진입하지 않습니다.
 레버리지 {leverage}로 계산되었습니다."""
-                send_telegram_message(message)
-                return {'status': 'rejected', 'reason': 'leverage_too_high', 'leverage': leverage}
-            
-            # ✅ 레버리지 API로 강제 적용
-            try:
-                # 현재 구현은 원웨이(기본) 기준으로 long 설정
-                bitget.set_leverage(symbol=symbol, leverage=leverage, hold_side='long')
-            except Exception as e:
-                error_msg = f"레버리지 설정 실패: {str(e)}"
-                send_telegram_message(f"❌ <b>거래 실행 중단</b>\n{error_msg}")
-                return {'status': 'error', 'message': error_msg}
-            
-            # 잔고 확인
-            balance = bitget.get_available_balance()
-            if balance < 10:
-                raise Exception(f"잔고 부족: {balance:.2f} USDT")
-            
-            # 포지션 크기 계산 - 안전 마진 적용
-            position_value = balance * 0.95  # 95%만 사용 (수수료 및 안전 마진)
-            position_notional = position_value * leverage
-            position_size = position_notional / entry_price
-            position_size = round(position_size, 3)
-            
-            if position_size < 0.001:
-                raise Exception(f"포지션 크기가 너무 작습니다: {position_size:.6f}")
-                
-            logger.info(f"포지션 계산: 잔고={balance:.2f}, 사용비율=95%, 레버리지={leverage}x, 포지션크기={position_size:.3f}")
-            
-            # 지정가 주문 실행
-            order_id = bitget.place_limit_order(
-                symbol=symbol,
-                side='buy',
-                size=position_size,
-                price=entry_price,
-                leverage=leverage,
-                tp_price=tp_price,
-                sl_price=sl_price
-            )
-            
-            if not order_id:
-                raise Exception("주문 실행 실패")
-            
-            # (참고) 저장은 하되, 보유 여부 판단에는 사용하지 않음
-            current_position = {
-                'symbol': symbol,
-                'entry_price': entry_price,
-                'tp_price': tp_price,
-                'sl_price': sl_price,
-                'size': position_size,
-                'leverage': leverage,
-                'order_id': order_id,
-                'timestamp': datetime.now().isoformat(),
-                'balance_used': position_value
-            }
-            
-            risk_amount = position_value * (LOSS_RATIO / 100)
-            potential_profit = position_value * leverage * ((tp_price - entry_price) / entry_price)
-            
-            message = f"""✅ <b>거래 진입 완료!</b>
+
+_ENTRY_SUCCESS_TEMPLATE = """✅ <b>거래 진입 완료!</b>
 
 📈 <b>심볼:</b> {symbol}
 
 💰 <b>진입가:</b> {entry_price:,.2f} USDT
-🎯 <b>익절가:</b> {tp_price:,.2f} USDT (+{((tp_price-entry_price)/entry_price)*100:.2f}%)
-🛑 <b>손절가:</b> {sl_price:,.2f} USDT ({((sl_price-entry_price)/entry_price)*100:.2f}%)
+🎯 <b>익절가:</b> {tp_price:,.2f} USDT (+{tp_percent:.2f}%)
+🛑 <b>손절가:</b> {sl_price:,.2f} USDT ({sl_percent:.2f}%)
 
 📊 <b>레버리지:</b> {leverage}x (API로 적용)
-💵 <b>사용 잔고:</b> {position_value:,.2f} USDT (95%)
+💵 <b>사용 잔고:</b> {balance_used:,.2f} USDT (95%)
 💵 <b>전체 잔고:</b> {balance:,.2f} USDT
-📈 <b>포지션 크기:</b> {position_size:.3f} {symbol.replace('USDT', '')}
+📈 <b>포지션 크기:</b> {size:.3f} {base_coin}
 
 💎 <b>예상 수익:</b> +{potential_profit:,.2f} USDT
-⚠️ <b>최대 손실:</b> -{risk_amount:,.2f} USDT ({LOSS_RATIO}%)
+⚠️ <b>최대 손실:</b> -{risk_amount:,.2f} USDT ({loss_ratio}%)
 
 📋 <b>주문 ID:</b> {order_id}"""
-            
-            send_telegram_message(message)
-            logger.info(f"거래 진입: {symbol} @ {entry_price}, 레버리지: {leverage}x")
-            
-            return {
-                'status': 'success',
-                'position': current_position
-            }
-            
-    except Exception as e:
-        error_message = f"""❌ <b>거래 실행 실패!</b>
 
-📈 <b>심볼:</b> {data.get('symbol')}
-⚠️ <b>오류:</b> {str(e)}
-⏰ <b>시간:</b> {datetime.now().strftime("%H:%M:%S")}"""
-        
-        send_telegram_message(error_message)
-        logger.error(f"거래 실행 실패: {str(e)}")
-        
-        return {
-            'status': 'error',
-            'message': str(e)
-        }
+_ENTRY_FAILED_TEMPLATE = """❌ <b>거래 실행 실패!</b>
 
-def execute_exit_trade(data: Dict) -> Dict:
-    """종료 신호 처리 (통계 기록용)
-    
-    주의: TP/SL은 이미 거래소에 설정되어 있으므로,
-    이 함수는 통계 업데이트와 알림 전송만 담당합니다.
-    실제 포지션 종료는 거래소가 자동으로 처리합니다.
-    """
-    global current_position, stats
-    
-    try:
-        with position_lock:
-            symbol = data.get('symbol', '')
-            exit_price = round(float(data.get('exit_price', 0)), 2)
-            result = data.get('result', '').upper()
-            
-            # (변경점) 메모리 대신 API 결과를 우선 참조하여 정보 보강
-            entry_price = None
-            leverage = None
-            balance_used = None
-            
-            try:
-                bitget = BitgetFuturesClient()
-                # 단일 심볼 포지션 조회(v1 사용 중이면 빈 데이터일 수도 있음)
-                positions = bitget.get_positions(symbol)
-                if positions:
-                    pos = positions[0]
-                    entry_price = float(pos.get('openPriceAvg') or pos.get('openAvgPrice') or 0)
-                    leverage = int(float(pos.get('leverage') or 1))
-            except Exception:
-                pass
-
-            # 메모리에 보조 데이터가 남아있으면 보완용으로만 사용 (확인 용도 아님)
-            if current_position and current_position.get('symbol') == symbol:
-                entry_price = entry_price or current_position.get('entry_price')
-                leverage = leverage or current_position.get('leverage')
-                balance_used = balance_used or current_position.get('balance_used')
+📈 <b>심볼:</b> {symbol}
+⚠️ <b>오류:</b> {error}
+⏰ <b>시간:</b> {time}"""
 
-            if not entry_price or not leverage:
-                # 정보가 부족해도 종료 알림은 보냄
-                message = f"""⚠️ <b>종료 신호 수신</b>
+_EXIT_UNKNOWN_TEMPLATE = """⚠️ <b>종료 신호 수신</b>
 
 📈 심볼: {symbol}
 🎯 종료가: {exit_price:,.2f}
 ℹ️ 포지션 세부정보를 API에서 확인할 수 없어 통계 갱신을 생략합니다."""
-                send_telegram_message(message)
-                return {
-                    'status': 'warning',
-                    'message': 'Position details unavailable; stats not updated.'
-                }
-            
-            # 수익률 계산
-            price_change_percent = ((exit_price - entry_price) / entry_price) * 100
-            profit_rate = price_change_percent * leverage
-            
-            # 투자금액 추정(없으면 계산식으로 대체)
-            if balance_used is None:
-                # entry_price * size 정보를 모르면 내부 정책으로 사용 잔고 95%를 재사용 불가 → 0 처리
-                balance_used = 0.0
-            profit_amount = balance_used * (profit_rate / 100)
-            
-            if result == 'PROFIT' or (entry_price and exit_price >= entry_price):
-                trade_result = 'WIN'
-                stats.add_trade('WIN', profit_rate, symbol)
-                emoji = "🎉"
-                result_text = "익절"
-            else:
-                trade_result = 'LOSS'
-                stats.add_trade('LOSS', profit_rate, symbol)
-                emoji = "😔"
-                result_text = "손절"
-            
-            stats.save()
-            
-            message = f"""{emoji} <b>거래 종료 알림</b>
+
+_EXIT_SUCCESS_TEMPLATE = """{emoji} <b>거래 종료 알림</b>
 
 📈 <b>심볼:</b> {symbol}
 🔥 <b>결과:</b> {result_text}
@@ -584,192 +787,562 @@ def execute_exit_trade(data: Dict) -> Dict:
 💰 <b>손익(추정):</b> {profit_amount:+,.2f} USDT
 
 📊 <b>전체 통계</b>
-✅ 익절: {stats.wins}회
-❌ 손절: {stats.losses}회
-📈 승률: {stats.get_win_rate():.1f}%
+✅ 익절: {wins}회
+❌ 손절: {losses}회
+📈 승률: {win_rate:.1f}%
 
 ℹ️ <i>주의: 보유 여부는 API로만 확인하며, 메모리는 보조 데이터로만 사용합니다</i>"""
-            
+
+_STATUS_REPORT_TEMPLATE = """📊 <b>거래 현황 및 통계</b>
+
+💰 <b>계좌 정보</b>
+• 가용 잔고: {balance:,.2f} USDT
+• 거래 상태: {position_info}
+
+📈 <b>거래 통계</b>
+• 익절: {wins}회
+• 손절: {losses}회
+• 전체: {total_trades}회
+• 승률: {win_rate:.1f}%
+
+📋 <b>최근 거래 (최대 5개)</b>{recent_trades}
+
+⏰ 통계 시작: {start_date:%Y-%m-%d %H:%M}"""
+
+_TRADE_ERROR_TEMPLATE = """❌ <b>거래 처리 오류</b>
+
+신호: {action} {symbol}
+오류: {error}
+시간: {time}"""
+
+_WEBHOOK_ERROR_TEMPLATE = """❌ <b>웹훅 처리 오류</b>
+
+오류: {error}
+시간: {time}
+
+TradingView Alert 설정을 확인해주세요."""
+
+_TRADE_DROPPED_TEMPLATE = """🚨 <b>미처리 거래 신호 (서버 종료)</b>
+
+신호: {action} {symbol}
+수신 후 경과: {waited:.1f}초
+시간: {time}
+
+서버 종료로 실행되지 않았습니다. 포지션을 직접 확인해주세요."""
+
+_UNKNOWN_FORMAT_TEMPLATE = """⚠️ <b>알 수 없는 웹훅 형식</b>
+
+받은 데이터: {preview}
+
+TradingView Alert 메시지를 JSON 형식으로 설정해주세요:
+{{"action": "ENTRY", "symbol": "BTCUSDT", ...}}"""
+
+# 설정 상수는 import 시 한 번만 채우고 요청마다 잔고만 포맷팅
+_SYSTEM_TEST_TEMPLATE = """🧪 <b>시스템 테스트</b>
+
+✅ 서버: 정상
+✅ Bitget API: 연결됨
+💰 잔고: {{balance:,.2f}} USDT
+📊 손실 비율: {loss_ratio}%
+🎰 최대 레버리지: {max_leverage}x
+
+텔레그램 명령어:
+/S - 상태 및 통계 조회
+/R - 통계 초기화
+/M - Bitget 서버 상태 확인""".format(loss_ratio=LOSS_RATIO, max_leverage=MAX_LEVERAGE)
+
+def _fmt_reject_leverage(symbol: str, leverage: int) -> str:
+    """레버리지 초과 거절 알림"""
+    return _REJECT_LEVERAGE_TEMPLATE.format_map({
+        'symbol': symbol,
+        'leverage': leverage,
+        'max_leverage': MAX_LEVERAGE
+    })
+
+def _fmt_entry_success(position: Dict, balance: float) -> str:
+    """진입 완료 알림 (position은 execute_entry_trade가 만든 current_position 형식)"""
+    entry_price = position['entry_price']
+    tp_change = (position['tp_price'] - entry_price) / entry_price
+    ctx = dict(position)
+    ctx.update({
+        'tp_percent': tp_change * 100,
+        'sl_percent': ((position['sl_price'] - entry_price) / entry_price) * 100,
+        'balance': balance,
+        'base_coin': position['symbol'].replace('USDT', ''),
+        'potential_profit': position['balance_used'] * position['leverage'] * tp_change,
+        'risk_amount': position['balance_used'] * (LOSS_RATIO / 100),
+        'loss_ratio': LOSS_RATIO
+    })
+    return _ENTRY_SUCCESS_TEMPLATE.format_map(ctx)
+
+def execute_entry_trade(data: Dict) -> Dict:
+    """진입 거래 실행
+    
+    position_lock은 pending_symbols 예약과 current_position 교체에만 짧게 사용하고,
+    Bitget/텔레그램 네트워크 호출은 락 밖에서 수행합니다.
+    """
+    global current_position
+    
+    symbol = data.get('symbol', '')
+    
+    # 1단계 (락): 같은 심볼 진입이 처리 중이면 중복 신호로 무시, 아니면 예약
+    with position_lock:
+        if symbol in pending_symbols:
+            logger.warning("%s 진입 처리 중 - 중복 신호 무시", symbol)
+            return {'status': 'ignored', 'reason': 'entry_in_progress'}
+        pending_symbols.add(symbol)
+    
+    try:
+        # 거래 파라미터 - 가격 정밀도 처리
+        entry_price = round(float(data.get('price', 0)), 2)
+        # tp/sl은 선택 필드 - 없거나 null이면 0 (레버리지 1, TP/SL 프리셋 없이 주문)
+        tp_price = round(float(data.get('tp') or 0), 2)
+        sl_price = round(float(data.get('sl') or 0), 2)
+        
+        # 레버리지 계산 (신호 값만으로 계산되므로 네트워크 호출 전에 먼저 검사)
+        leverage = calculate_leverage(entry_price, sl_price)
+        
+        # 레버리지가 31 이상이면 거래 중단 (상한 체크는 내부 정책)
+        if leverage > MAX_LEVERAGE:
+            # 메시지 포맷팅은 텔레그램 워커에서 수행 (거절 경로에서 문자열 생성 생략)
+            send_telegram_message(functools.partial(_fmt_reject_leverage, symbol, leverage))
+            return {'status': 'rejected', 'reason': 'leverage_too_high', 'leverage': leverage}
+        
+        # 2단계 (락 없음): 모든 네트워크 호출
+        bitget = bitget_client
+        
+        # 포지션 조회와 잔고 조회는 서로 독립적이므로 동시에 요청 (RTT 1회 절약)
+        f_pos = io_pool.submit(bitget.get_positions, symbol)
+        f_bal = io_pool.submit(bitget.get_available_balance)
+        
+        # ✅ 핵심 변경 2: 메모리(current_position)로 보유 여부 체크 제거
+        #    무조건 API로만 확인
+        positions = f_pos.result()
+        if positions and len(positions) > 0:
+            message = "⚠️ Bitget에 이미 열린 포지션이 있습니다. 신호를 무시합니다."
             send_telegram_message(message)
-            logger.info(f"거래 종료: {symbol} - {result_text}, 수익률: {profit_rate:.2f}%")
+            return {'status': 'ignored', 'reason': 'position_exists_on_exchange'}
+        
+        # ✅ 레버리지 API로 강제 적용
+        try:
+            # 현재 구현은 원웨이(기본) 기준으로 long 설정
+            bitget.set_leverage(symbol=symbol, leverage=leverage, hold_side='long')
+        except Exception as e:
+            error_msg = f"레버리지 설정 실패: {str(e)}"
+            send_telegram_message(f"❌ <b>거래 실행 중단</b>\n{error_msg}")
+            return {'status': 'error', 'message': error_msg}
+        
+        # 잔고 확인
+        balance = f_bal.result()
+        if balance < 10:
+            raise Exception(f"잔고 부족: {balance:.2f} USDT")
+        
+        # 포지션 크기 계산 - 안전 마진 적용
+        position_value = balance * 0.95  # 95%만 사용 (수수료 및 안전 마진)
+        position_notional = position_value * leverage
+        position_size = position_notional / entry_price
+        position_size = round(position_size, 3)
+        
+        if position_size < 0.001:
+            raise Exception(f"포지션 크기가 너무 작습니다: {position_size:.6f}")
             
-            # 포지션 초기화(보조 데이터)
-            current_position = None
+        logger.info("포지션 계산: 잔고=%.2f, 사용비율=95%%, 레버리지=%sx, 포지션크기=%.3f", balance, leverage, position_size)
+        
+        # 지정가 주문 실행
+        order_started_ns = time.perf_counter_ns()
+        order_id = bitget.place_limit_order(
+            symbol=symbol,
+            side='buy',
+            size=position_size,
+            price=entry_price,
+            leverage=leverage,
+            tp_price=tp_price,
+            sl_price=sl_price
+        )
+        
+        logger.info("지연 시간 [ENTRY] 주문 %.1fms", (time.perf_counter_ns() - order_started_ns) / 1e6)
+        
+        if not order_id:
+            raise Exception("주문 실행 실패")
+        bitget.invalidate_cache()  # 증거금이 묶였으므로 다음 조회는 새로 요청
+        
+        # (참고) 저장은 하되, 보유 여부 판단에는 사용하지 않음
+        new_position = {
+            'symbol': symbol,
+            'entry_price': entry_price,
+            'tp_price': tp_price,
+            'sl_price': sl_price,
+            'size': position_size,
+            'leverage': leverage,
+            'order_id': order_id,
+            'timestamp': datetime.now().isoformat(),
+            'balance_used': position_value
+        }
+        
+        # 3단계 (락): 메모리 보조 데이터 교체
+        with position_lock:
+            current_position = new_position
+        _save_position()  # 파일 기록은 락 밖에서
+        
+        # 알림 문구는 텔레그램 워커에서 포맷팅 (주문 응답 경로에서 제외)
+        send_telegram_message(functools.partial(_fmt_entry_success, new_position, balance))
+        logger.info("거래 진입: %s @ %s, 레버리지: %sx", symbol, entry_price, leverage)
+        
+        return {
+            'status': 'success',
+            'position': new_position
+        }
             
+    except Exception as e:
+        send_telegram_message(functools.partial(_ENTRY_FAILED_TEMPLATE.format_map, {
+            'symbol': data.get('symbol'),
+            'error': e,
+            'time': time.strftime('%H:%M:%S')
+        }))
+        logger.error("거래 실행 실패: %s", e)
+        
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    
+    finally:
+        with position_lock:
+            pending_symbols.discard(symbol)
+
+def execute_exit_trade(data: Dict) -> Dict:
+    """종료 신호 처리 (통계 기록용)
+    
+    주의: TP/SL은 이미 거래소에 설정되어 있으므로,
+    이 함수는 통계 업데이트와 알림 전송만 담당합니다.
+    실제 포지션 종료는 거래소가 자동으로 처리합니다.
+    position_lock은 메모리/통계 갱신 구간에서만 잡습니다.
+    """
+    global current_position
+    
+    try:
+        symbol = data.get('symbol', '')
+        exit_price = round(float(data.get('exit_price', 0)), 2)
+        result = (data.get('result') or '').upper()
+        
+        # (변경점) 메모리 대신 API 결과를 우선 참조하여 정보 보강
+        entry_price = None
+        leverage = None
+        balance_used = None
+        
+        try:
+            bitget = bitget_client
+            # 단일 심볼 포지션 조회(v1 사용 중이면 빈 데이터일 수도 있음)
+            positions = bitget.get_positions(symbol)
+            if positions:
+                pos = positions[0]
+                entry_price = float(pos.get('openPriceAvg') or pos.get('openAvgPrice') or 0)
+                leverage = int(float(pos.get('leverage') or 1))
+        except Exception:
+            pass
+        
+        with position_lock:
+            # 메모리에 보조 데이터가 남아있으면 보완용으로만 사용 (확인 용도 아님)
+            if current_position and current_position.get('symbol') == symbol:
+                entry_price = entry_price or current_position.get('entry_price')
+                leverage = leverage or current_position.get('leverage')
+                balance_used = balance_used or current_position.get('balance_used')
+            
+            position_known = bool(entry_price and leverage)
+            if position_known:
+                # 수익률 계산
+                price_change_percent = ((exit_price - entry_price) / entry_price) * 100
+                profit_rate = price_change_percent * leverage
+                
+                # 투자금액 추정(없으면 계산식으로 대체)
+                if balance_used is None:
+                    # entry_price * size 정보를 모르면 내부 정책으로 사용 잔고 95%를 재사용 불가 → 0 처리
+                    balance_used = 0.0
+                profit_amount = balance_used * (profit_rate / 100)
+                
+                if result == 'PROFIT' or (entry_price and exit_price >= entry_price):
+                    trade_result = 'WIN'
+                    emoji = "🎉"
+                    result_text = "익절"
+                else:
+                    trade_result = 'LOSS'
+                    emoji = "😔"
+                    result_text = "손절"
+                
+                stats.add_trade(trade_result, profit_rate, symbol)
+                wins, losses, win_rate = stats.wins, stats.losses, stats.get_win_rate()
+                
+                # 포지션 초기화(보조 데이터)
+                current_position = None
+        
+        if position_known:
+            _save_position()
+        
+        bitget_client.invalidate_cache()  # 청산으로 잔고/포지션이 바뀌었으므로 캐시 폐기
+        
+        if not position_known:
+            # 정보가 부족해도 종료 알림은 보냄
+            send_telegram_message(functools.partial(_EXIT_UNKNOWN_TEMPLATE.format_map, {
+                'symbol': symbol,
+                'exit_price': exit_price
+            }))
             return {
-                'status': 'success',
-                'result': trade_result,
-                'profit_rate': profit_rate,
-                'profit_amount': profit_amount
+                'status': 'warning',
+                'message': 'Position details unavailable; stats not updated.'
             }
+        
+        # 알림 문구는 텔레그램 워커에서 포맷팅 (값은 위에서 잠금 안에 스냅샷)
+        send_telegram_message(functools.partial(_EXIT_SUCCESS_TEMPLATE.format_map, {
+            'emoji': emoji,
+            'symbol': symbol,
+            'result_text': result_text,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'price_change_percent': price_change_percent,
+            'leverage': leverage,
+            'balance_used': balance_used,
+            'profit_rate': profit_rate,
+            'profit_amount': profit_amount,
+            'wins': wins,
+            'losses': losses,
+            'win_rate': win_rate
+        }))
+        logger.info("거래 종료: %s - %s, 수익률: %.2f%%", symbol, result_text, profit_rate)
+        
+        return {
+            'status': 'success',
+            'result': trade_result,
+            'profit_rate': profit_rate,
+            'profit_amount': profit_amount
+        }
                 
     except Exception as e:
-        logger.error(f"종료 처리 실패: {str(e)}")
+        logger.error("종료 처리 실패: %s", e)
         return {
             'status': 'error',
             'message': str(e)
         }
 
 # 텔레그램 명령어 처리를 위한 스레드
+def handle_telegram_update(update: Dict):
+    """텔레그램 업데이트 처리 (폴링/웹훅 공용) - 설정된 채팅방의 텍스트 메시지만 명령으로 처리"""
+    message = update.get('message')
+    if message and 'text' in message:
+        if str(message['chat']['id']) == TELEGRAM_CHAT_ID:
+            handle_telegram_command(message['text'])
+
+# 웹훅 모드 업데이트 큐 (/telegram은 큐에 넣고 즉시 200 응답, 명령 처리는 워커에서)
+telegram_update_queue = queue.Queue(maxsize=100)
+_seen_update_ids = collections.deque(maxlen=100)  # 텔레그램 재전송 업데이트 중복 처리 방지
+_seen_update_ids_lock = threading.Lock()
+
+def _is_new_update(update_id) -> bool:
+    """처음 받은 update_id면 기록 후 True"""
+    with _seen_update_ids_lock:
+        if update_id in _seen_update_ids:
+            return False
+        _seen_update_ids.append(update_id)
+        return True
+
+def _telegram_update_worker():
+    """웹훅 모드 텔레그램 업데이트 처리 워커"""
+    while True:
+        update = telegram_update_queue.get()
+        try:
+            handle_telegram_update(update)
+        except Exception as e:
+            logger.error("텔레그램 웹훅 처리 오류: %s", e)
+
+def register_telegram_webhook() -> bool:
+    """텔레그램 setWebhook 등록 (웹훅 모드, 시크릿 토큰 필수)"""
+    payload = {
+        'url': TELEGRAM_WEBHOOK_URL,
+        'allowed_updates': ['message'],
+        'secret_token': TELEGRAM_WEBHOOK_SECRET
+    }
+    try:
+        response = TELEGRAM_SESSION.post(f"{TELEGRAM_API_URL}/setWebhook", data=orjson.dumps(payload), timeout=10)
+        ok = response.status_code == 200 and orjson.loads(response.content).get('ok', False)
+    except Exception as e:
+        logger.error("텔레그램 웹훅 등록 오류: %s", e)
+        return False
+    if ok:
+        logger.info("텔레그램 웹훅 등록 완료: %s", TELEGRAM_WEBHOOK_URL)
+    else:
+        logger.error("텔레그램 웹훅 등록 실패: HTTP %s", response.status_code)
+    return ok
+
 def telegram_bot_polling():
     """텔레그램 봇 폴링"""
-    import time
     last_update_id = 0
+    retry_delay = 5  # 오류 시 대기 시간 (연속 오류마다 2배, 최대 30초)
+    
+    # 이전에 등록된 웹훅이 남아 있으면 getUpdates가 409를 반환하므로 먼저 해제
+    try:
+        TELEGRAM_SESSION.post(f"{TELEGRAM_API_URL}/deleteWebhook", timeout=10)
+    except Exception as e:
+        logger.warning("텔레그램 웹훅 해제 실패: %s", e)
     
     while True:
         try:
-            url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getUpdates"
-            params = {'offset': last_update_id + 1, 'timeout': 30}
-            response = requests.get(url, params=params, timeout=35)
+            # 롱폴링: 텔레그램 서버가 최대 50초 대기하므로 성공 시 별도 sleep 없이 바로 다음 요청
+            params = {'offset': last_update_id + 1, 'timeout': 50}
+            response = TELEGRAM_SESSION.get(TELEGRAM_UPDATES_URL, params=params, timeout=55)
             
             if response.status_code == 200:
-                updates = response.json().get('result', [])
+                retry_delay = 5
+                updates = orjson.loads(response.content).get('result', [])
                 
                 for update in updates:
                     last_update_id = update['update_id']
-                    
-                    if 'message' in update and 'text' in update['message']:
-                        text = update['message']['text']
-                        chat_id = update['message']['chat']['id']
-                        
-                        if str(chat_id) == TELEGRAM_CHAT_ID:
-                            handle_telegram_command(text)
-            
-            time.sleep(1)
+                    handle_telegram_update(update)
+            else:
+                # 토큰 오류/중복 폴링(409) 등은 즉시 재시도해도 같은 결과이므로 대기
+                logger.warning("텔레그램 폴링 응답 오류: HTTP %s", response.status_code)
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
             
         except Exception as e:
-            logger.error(f"텔레그램 폴링 오류: {str(e)}")
-            time.sleep(5)
+            logger.error("텔레그램 폴링 오류: %s", e)
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30)
 
-def handle_telegram_command(command: str):
-    """텔레그램 명령어 처리"""
-    global stats
+# /M 시간 동기화 확인 결과 캐시 (문구, time.monotonic() 확인 시각)
+TIME_SYNC_CACHE_TTL = 30
+_time_sync_cache = None
+
+def _check_time_sync() -> str:
+    """Bitget 서버 시간과 로컬 시간 차이 확인 (/M) - 결과 문구를 TIME_SYNC_CACHE_TTL초 동안 재사용"""
+    global _time_sync_cache
+    cached = _time_sync_cache
+    if cached is not None and time.monotonic() - cached[1] < TIME_SYNC_CACHE_TTL:
+        return cached[0]
     
     try:
-        if command == '/R' or command == '/r':
-            stats.reset()
-            stats.save()
-            
-            message = """🔄 <b>통계가 초기화되었습니다</b>
+        response = BITGET_SESSION.get(
+            BITGET_TIME_URL,
+            timeout=5
+        )
+        
+        if response.status_code == 200:
+            server_data = orjson.loads(response.content)
+            if server_data.get('code') == '00000':
+                server_timestamp = int(server_data.get('data', 0))
+                local_timestamp = time.time_ns() // 1_000_000
+                time_diff = abs(server_timestamp - local_timestamp)
+                
+                if time_diff < 1000:
+                    time_sync = f"✅ 완벽 동기화 ({time_diff}ms)"
+                elif time_diff < 5000:
+                    time_sync = f"✅ 정상 ({time_diff}ms 차이)"
+                elif time_diff < 30000:
+                    time_sync = f"⚠️ 약간 차이 ({time_diff}ms)"
+                else:
+                    time_sync = f"❌ 큰 차이 ({time_diff/1000:.1f}초)"
+            else:
+                response2 = BITGET_SESSION.get(
+                    f"{BITGET_BASE_URL}/api/spot/v1/public/time",
+                    timeout=5
+                )
+                if response2.status_code == 200:
+                    server_data2 = orjson.loads(response2.content)
+                    if server_data2.get('code') == '00000':
+                        server_timestamp = int(server_data2.get('data', {}).get('serverTime', 0))
+                        local_timestamp = time.time_ns() // 1_000_000
+                        time_diff = abs(server_timestamp - local_timestamp)
+                        time_sync = f"정상 ({time_diff}ms 차이)" if time_diff < 5000 else f"차이 {time_diff}ms"
+                    else:
+                        time_sync = "API 응답 오류"
+                else:
+                    time_sync = "서버 접근 불가"
+        else:
+            time_sync = f"로컬 시간 사용"
+    
+    except Exception as e:
+        time_sync = "확인 생략 (영향 없음)"
+        logger.debug("시간 동기화 확인 실패: %s", e)
+        return time_sync
+    
+    _time_sync_cache = (time_sync, time.monotonic())
+    return time_sync
+
+def _reset_stats():
+    """/R - 통계 초기화"""
+    stats.reset()
+    
+    message = """🔄 <b>통계가 초기화되었습니다</b>
 
 ✅ 익절: 0회
 ❌ 손절: 0회
 📈 승률: 0.0%
 
 새로운 통계 수집을 시작합니다."""
-            send_telegram_message(message)
-            
-        elif command == '/M' or command == '/m':
-            message = "🔍 <b>Bitget 서버 연결 확인 중...</b>"
-            send_telegram_message(message)
-            
-            try:
-                bitget = BitgetFuturesClient()
-                start_time = time.time()
-                
-                balance = bitget.get_available_balance()
-                api_latency = (time.time() - start_time) * 1000  # ms
-                
-                detailed_balance_info = ""
-                try:
-                    accounts_result = bitget._make_request('GET', '/account/accounts', {'productType': 'umcbl'})
-                    if accounts_result:
-                        if isinstance(accounts_result, list):
-                            for acc in accounts_result:
-                                if acc.get('marginCoin') == 'USDT':
-                                    equity = acc.get('usdtEquity', 0)
-                                    available = acc.get('available', 0)
-                                    cross_available = acc.get('crossMaxAvailable', 0)
-                                    frozen = acc.get('frozen', 0)
-                                    unrealized_pnl = acc.get('unrealizedPL', 0)
-                                    detailed_balance_info = f"""
+    send_telegram_message(message)
+
+def _server_status():
+    """/M - Bitget 서버 상태 확인"""
+    message = "🔍 <b>Bitget 서버 연결 확인 중...</b>"
+    send_telegram_message(message)
+    
+    try:
+        bitget = bitget_client
+        detailed_balance_info = ""
+        # 계좌 상세 / 서버 시간 / 포지션 조회는 서로 독립적이므로 동시에 요청 (총 지연 = 가장 느린 호출)
+        start_time = time.monotonic_ns()
+        f_usdt = io_pool.submit(bitget.get_usdt_balance)
+        f_time = io_pool.submit(_check_time_sync)
+        f_pos = io_pool.submit(bitget.get_positions, None, POSITIONS_CACHE_TTL)
+        try:
+            usdt = f_usdt.result()
+        except Exception as e:
+            usdt = None
+            detailed_balance_info = f"\n⚠️ 상세 정보 조회 실패: {str(e)}"
+        api_latency = (time.monotonic_ns() - start_time) / 1e6  # ms
+        
+        if usdt is not None:
+            detailed_balance_info = f"""
 💎 <b>계좌 상세:</b>
-• 총 자산: {float(equity):,.2f} USDT
-• 가용 잔고: {float(available):,.2f} USDT
-• 크로스 가용: {float(cross_available):,.2f} USDT
-• 동결 금액: {float(frozen):,.2f} USDT
-• 미실현 손익: {float(unrealized_pnl):,.2f} USDT"""
-                                    balance = max(float(available), float(cross_available), float(equity))
-                except Exception as e:
-                    detailed_balance_info = f"\n⚠️ 상세 정보 조회 실패: {str(e)}"
-                
-                server_time_test = True
-                time_sync = "확인 중..."
-                try:
-                    response = requests.get(
-                        f"{BITGET_BASE_URL}/api/mix/v1/market/time",
-                        timeout=5
-                    )
-                    
-                    if response.status_code == 200:
-                        server_data = response.json()
-                        if server_data.get('code') == '00000':
-                            server_timestamp = int(server_data.get('data', 0))
-                            local_timestamp = int(time.time() * 1000)
-                            time_diff = abs(server_timestamp - local_timestamp)
-                            
-                            if time_diff < 1000:
-                                time_sync = f"✅ 완벽 동기화 ({time_diff}ms)"
-                            elif time_diff < 5000:
-                                time_sync = f"✅ 정상 ({time_diff}ms 차이)"
-                            elif time_diff < 30000:
-                                time_sync = f"⚠️ 약간 차이 ({time_diff}ms)"
-                            else:
-                                time_sync = f"❌ 큰 차이 ({time_diff/1000:.1f}초)"
-                        else:
-                            response2 = requests.get(
-                                f"{BITGET_BASE_URL}/api/spot/v1/public/time",
-                                timeout=5
-                            )
-                            if response2.status_code == 200:
-                                server_data2 = response2.json()
-                                if server_data2.get('code') == '00000':
-                                    server_timestamp = int(server_data2.get('data', {}).get('serverTime', 0))
-                                    local_timestamp = int(time.time() * 1000)
-                                    time_diff = abs(server_timestamp - local_timestamp)
-                                    time_sync = f"정상 ({time_diff}ms 차이)" if time_diff < 5000 else f"차이 {time_diff}ms"
-                                else:
-                                    time_sync = "API 응답 오류"
-                            else:
-                                time_sync = "서버 접근 불가"
-                    else:
-                        time_sync = f"로컬 시간 사용"
-                        
-                except Exception as e:
-                    server_time_test = False
-                    time_sync = "확인 생략 (영향 없음)"
-                    logger.debug(f"시간 동기화 확인 실패: {str(e)}")
-                
-                positions_test = True
-                positions_info = ""
-                try:
-                    positions = bitget.get_positions()
-                    positions_count = len(positions) if positions else 0
-                    if positions and len(positions) > 0:
-                        positions_info = "\n📊 <b>활성 포지션:</b>"
-                        for pos in positions[:3]:
-                            symbol = pos.get('symbol', 'Unknown')
-                            side = pos.get('holdSide', '')
-                            size = pos.get('total', 0)
-                            positions_info += f"\n• {symbol}: {side} {size}"
-                except:
-                    positions_test = False
-                    positions_count = -1
-                
-                if api_latency < 3000:
-                    status_emoji = "✅"
-                    status_text = "정상"
-                    status_detail = "모든 시스템 정상 작동"
-                elif api_latency < 5000:
-                    status_emoji = "⚠️"
-                    status_text = "느림"
-                    status_detail = f"응답 지연 ({api_latency:.0f}ms)"
-                else:
-                    status_emoji = "❌"
-                    status_text = "매우 느림"
-                    status_detail = f"심각한 지연 ({api_latency:.0f}ms)"
-                
-                message = f"""{status_emoji} <b>Bitget 서버 상태</b>
+• 총 자산: {usdt.equity:,.2f} USDT
+• 가용 잔고: {usdt.available:,.2f} USDT
+• 크로스 가용: {usdt.cross_max:,.2f} USDT
+• 동결 금액: {usdt.frozen:,.2f} USDT
+• 미실현 손익: {usdt.unrealized_pnl:,.2f} USDT"""
+            balance = max(usdt.available, usdt.cross_max, usdt.equity)
+        else:
+            balance = bitget.get_available_balance()
+        
+        time_sync = f_time.result()
+        
+        positions_test = True
+        positions_info = ""
+        try:
+            positions = f_pos.result()
+            positions_count = len(positions) if positions else 0
+            if positions and len(positions) > 0:
+                positions_info = "\n📊 <b>활성 포지션:</b>"
+                for pos in positions[:3]:
+                    symbol = pos.get('symbol', 'Unknown')
+                    side = pos.get('holdSide', '')
+                    size = pos.get('total', 0)
+                    positions_info += f"\n• {symbol}: {side} {size}"
+        except:
+            positions_test = False
+            positions_count = -1
+        
+        if api_latency < 3000:
+            status_emoji = "✅"
+            status_text = "정상"
+            status_detail = "모든 시스템 정상 작동"
+        elif api_latency < 5000:
+            status_emoji = "⚠️"
+            status_text = "느림"
+            status_detail = f"응답 지연 ({api_latency:.0f}ms)"
+        else:
+            status_emoji = "❌"
+            status_text = "매우 느림"
+            status_detail = f"심각한 지연 ({api_latency:.0f}ms)"
+        
+        message = f"""{status_emoji} <b>Bitget 서버 상태</b>
 
 📡 <b>연결 상태:</b> {status_text}
 ⚡ <b>응답 속도:</b> {api_latency:.0f}ms
@@ -778,13 +1351,13 @@ def handle_telegram_command(command: str):
 📈 <b>포지션 수:</b> {positions_count if positions_count >= 0 else '확인 불가'}개{positions_info}
 
 📝 <b>상태 요약:</b> {status_detail}
-⏰ <b>확인 시간:</b> {datetime.now().strftime('%H:%M:%S')}
+⏰ <b>확인 시간:</b> {time.strftime('%H:%M:%S')}
 
 💡 <b>참고:</b> 선물 계좌 잔고를 표시합니다.
 현물 계좌와는 별도로 관리됩니다."""
-                
-            except Exception as e:
-                message = f"""❌ <b>Bitget 서버 연결 실패</b>
+        
+    except Exception as e:
+        message = f"""❌ <b>Bitget 서버 연결 실패</b>
 
 ⚠️ <b>오류 내용:</b> {str(e)}
 
@@ -795,166 +1368,381 @@ def handle_telegram_command(command: str):
 4. API 권한 설정 확인 (Futures 권한)
 5. IP 화이트리스트 설정 확인
 
-⏰ <b>확인 시간:</b> {datetime.now().strftime('%H:%M:%S')}"""
-            
-            send_telegram_message(message)
-            
-        elif command == '/S' or command == '/s':
-            bitget = BitgetFuturesClient()
-            balance = bitget.get_available_balance()
-            positions = bitget.get_positions()
-            
-            position_info = "없음"
-            if current_position:
-                position_info = f"{current_position['symbol']} (레버리지: {current_position['leverage']}x)"
-            elif positions:
-                position_info = f"{len(positions)}개 포지션 활성"
-            
-            recent_trades = ""
-            if stats.trades_history:
-                last_5_trades = stats.trades_history[-5:]
-                for trade in reversed(last_5_trades):
-                    emoji = "✅" if trade['result'] == 'WIN' else "❌"
-                    recent_trades += f"\n{emoji} {trade['symbol']}: {trade['profit_rate']:+.2f}%"
-            
-            if not recent_trades:
-                recent_trades = "\n최근 거래 없음"
-            
-            message = f"""📊 <b>거래 현황 및 통계</b>
-
-💰 <b>계좌 정보</b>
-• 가용 잔고: {balance:,.2f} USDT
-• 거래 상태: {position_info}
+⏰ <b>확인 시간:</b> {time.strftime('%H:%M:%S')}"""
+    
+    send_telegram_message(message)
 
-📈 <b>거래 통계</b>
-• 익절: {stats.wins}회
-• 손절: {stats.losses}회
-• 전체: {stats.total_trades}회
-• 승률: {stats.get_win_rate():.1f}%
+def _stats_report():
+    """/S - 거래 현황 및 통계"""
+    bitget = bitget_client
+    balance = bitget.get_available_balance()
+    positions = bitget.get_positions(max_age=POSITIONS_CACHE_TTL)
+    
+    position_info = "없음"
+    position = current_position  # 거래 워커가 도중에 교체할 수 있으므로 한 번만 읽음
+    if position:
+        position_info = f"{position['symbol']} (레버리지: {position['leverage']}x)"
+        if position.get('unconfirmed'):
+            # 재시작 전 기록은 거래소에서 TP/SL로 이미 청산됐을 수 있음 (보유 여부는 API 기준)
+            position_info += f" - 재시작 전 기록, 미확인 (API 활성 포지션 {len(positions)}개)"
+    elif positions:
+        position_info = f"{len(positions)}개 포지션 활성"
+    
+    message = _STATUS_REPORT_TEMPLATE.format_map({
+        'balance': balance,
+        'position_info': position_info,
+        'wins': stats.wins,
+        'losses': stats.losses,
+        'total_trades': stats.total_trades,
+        'win_rate': stats.get_win_rate(),
+        'recent_trades': stats.get_recent_trades_text(),
+        'start_date': stats.start_date
+    })
+    send_telegram_message(message)
 
-📋 <b>최근 거래 (최대 5개)</b>{recent_trades}
+# 텔레그램 명령어 → 처리 함수 (대소문자 구분 없음)
+_COMMAND_HANDLERS = {
+    '/r': _reset_stats,
+    '/m': _server_status,
+    '/s': _stats_report,
+}
 
-⏰ 통계 시작: {stats.start_date.strftime('%Y-%m-%d %H:%M')}"""
-            
-            send_telegram_message(message)
-            
+def handle_telegram_command(command: str):
+    """텔레그램 명령어 처리"""
+    handler = _COMMAND_HANDLERS.get(command.lower())
+    if handler is None:
+        return
+    
+    try:
+        handler()
     except Exception as e:
-        logger.error(f"명령어 처리 오류: {str(e)}")
+        logger.error("명령어 처리 오류: %s", e)
         send_telegram_message(f"❌ 명령어 처리 중 오류 발생: {str(e)}")
 
 # Flask 라우트
+# 헬스 체크 응답의 고정 부분 (닫는 중괄호 제외) - 시간/포지션/통계만 요청마다 이어 붙임
+_HEALTH_PREFIX = orjson.dumps({
+    'status': 'healthy',
+    'message': 'Bitget 자동거래 웹훅 서버 작동중',
+    'settings': {
+        'loss_ratio': LOSS_RATIO,
+        'max_leverage': MAX_LEVERAGE,
+        'position_size': '100%'
+    }
+})[:-1]
+
 @app.route('/', methods=['GET'])
 def home():
-    """서버 상태 확인"""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'Bitget 자동거래 웹훅 서버 작동중',
-        'time': datetime.now().isoformat(),
-        'settings': {
-            'loss_ratio': LOSS_RATIO,
-            'max_leverage': MAX_LEVERAGE,
-            'position_size': '100%'
-        },
-        'active_position': current_position is not None,
-        'stats': {
-            'wins': stats.wins,
-            'losses': stats.losses,
-            'win_rate': stats.get_win_rate()
-        }
-    })
+    """서버 상태 확인 (모니터링이 자주 호출하므로 고정 부분은 미리 직렬화한 bytes 사용)"""
+    position = current_position  # 거래 워커가 도중에 None으로 바꿀 수 있으므로 한 번만 읽음
+    body = b''.join((
+        _HEALTH_PREFIX,
+        b',"time":"', datetime.now().isoformat().encode(),
+        b'","active_position":', b'true' if position is not None and not position.get('unconfirmed') else b'false',
+        b',"stats":', stats.get_summary_json(),
+        b'}'
+    ))
+    return Response(body, mimetype='application/json')
+
+# 웹훅 중복 수신 차단 (TradingView 타임아웃 재전송 대비)
+WEBHOOK_DEDUP_WINDOW = 10  # 같은 페이로드를 중복으로 보는 시간 (초)
+WEBHOOK_DEDUP_SIZE = 256
+_recent_webhooks = collections.OrderedDict()  # 페이로드 해시 -> (처리 시각, 응답, 상태 코드)
+_recent_webhooks_lock = threading.Lock()
+
+RAW_MESSAGE_LIMIT = 200  # JSON이 아닌 웹훅 본문 미리보기 길이 (문자 수)
+
+# 알 수 없는 형식 알림 제한 (잘못 설정된 Alert가 반복될 때 텔레그램 도배 방지)
+UNKNOWN_NOTICE_WINDOW = 60  # 같은 내용의 알림을 다시 보내지 않는 시간 (초)
+UNKNOWN_NOTICE_SIZE = 64
+_recent_unknown_notices = collections.OrderedDict()  # 미리보기 문자열 -> 알림 시각
+_recent_unknown_notices_lock = threading.Lock()
+
+def _webhook_key(data: dict) -> bytes:
+    """웹훅 페이로드 해시 (키 순서 무관, 인증 용도가 아니므로 blake2b 사용)"""
+    return hashlib.blake2b(orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
+def _get_recent_webhook(key: bytes) -> Optional[Tuple[dict, int]]:
+    """최근 처리한 같은 웹훅의 응답 조회"""
+    with _recent_webhooks_lock:
+        entry = _recent_webhooks.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > WEBHOOK_DEDUP_WINDOW:
+            del _recent_webhooks[key]
+            return None
+        return entry[1], entry[2]
+
+def _remember_webhook(key: bytes, result: dict, status: int):
+    """처리한 웹훅 응답 기록 (오래된 항목부터 제거)"""
+    with _recent_webhooks_lock:
+        _recent_webhooks[key] = (time.monotonic(), result, status)
+        _recent_webhooks.move_to_end(key)
+        while len(_recent_webhooks) > WEBHOOK_DEDUP_SIZE:
+            _recent_webhooks.popitem(last=False)
+
+def _should_notify_unknown(preview: str) -> bool:
+    """같은 미리보기로 최근 알림을 보내지 않았으면 기록 후 True"""
+    now = time.monotonic()
+    with _recent_unknown_notices_lock:
+        sent_at = _recent_unknown_notices.get(preview)
+        if sent_at is not None and now - sent_at <= UNKNOWN_NOTICE_WINDOW:
+            return False
+        _recent_unknown_notices[preview] = now
+        _recent_unknown_notices.move_to_end(preview)
+        while len(_recent_unknown_notices) > UNKNOWN_NOTICE_SIZE:
+            _recent_unknown_notices.popitem(last=False)
+        return True
+
+# 신호별 필수 숫자 필드 (TradingView 템플릿은 숫자를 문자열로 보내기도 하므로 float 변환 가능 여부로 검사)
+_SIGNAL_PRICE_FIELDS = {
+    'ENTRY': ('price',),
+    'EXIT': ('exit_price',),
+}
+# 값이 있을 때만 검사하는 필드 (tp/sl 없는 ENTRY는 레버리지 1, TP/SL 프리셋 없이 진입)
+_SIGNAL_OPTIONAL_PRICE_FIELDS = {
+    'ENTRY': ('tp', 'sl'),
+    'EXIT': (),
+}
+
+def _validate_signal(action: str, data: Dict) -> Optional[str]:
+    """ENTRY/EXIT 페이로드 사전 검증 - 문제가 있으면 오류 메시지, 정상이면 None"""
+    symbol = data.get('symbol')
+    if not isinstance(symbol, str) or not symbol:
+        return "symbol must be a non-empty string"
+    optional = _SIGNAL_OPTIONAL_PRICE_FIELDS[action]
+    for field in _SIGNAL_PRICE_FIELDS[action] + optional:
+        value = data.get(field)
+        if value is None and field in optional:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return f"{field} must be a number"
+        try:
+            number = float(value)
+        except ValueError:
+            return f"{field} must be a number"
+        if not math.isfinite(number):  # "inf", "1e400" 등은 워커에서 NaN 레버리지가 되므로 거절
+            return f"{field} must be a finite number"
+        if not number > 0:
+            return f"{field} must be greater than 0"
+    if action == 'EXIT':
+        result = data.get('result')
+        if result is not None and not isinstance(result, str):
+            return "result must be a string"
+    return None
+
+# 거래 실행 큐 (웹훅은 즉시 202 응답, 실제 주문은 거래 워커 스레드에서 처리)
+TRADE_WORKERS = int(os.environ.get('TRADE_WORKERS', 1))  # 1이면 신호 수신 순서(진입 → 청산) 그대로 처리
+trade_queue = queue.Queue(maxsize=1024)  # (페이로드, 수신 시각 perf_counter_ns)
+
+def _report_dropped_trades():
+    """종료 시 큐에 남아 실행되지 못한 ENTRY/EXIT 기록 및 알림 (202로 응답했으므로 TradingView는 재전송하지 않음)"""
+    while True:
+        try:
+            data, queued_ns = trade_queue.get_nowait()
+        except queue.Empty:
+            return
+        action, symbol = data.get('action', '').upper(), data.get('symbol', '')
+        waited = (time.perf_counter_ns() - queued_ns) / 1e9
+        logger.error("서버 종료로 미처리 거래 신호 유실: %s %s (페이로드: %s)", action, symbol, data)
+        send_telegram_message(functools.partial(_TRADE_DROPPED_TEMPLATE.format_map, {
+            'action': action,
+            'symbol': symbol,
+            'waited': waited,
+            'time': time.strftime('%H:%M:%S')
+        }))
+
+# atexit은 등록 역순 실행 → 텔레그램 큐 비우기(_drain_telegram_queue)보다 먼저 실행되어 알림도 전송됨
+atexit.register(_report_dropped_trades)
+
+# 웹훅 action -> 거래 실행 함수 (대문자 키, 웹훅에서 검증 후 큐에 들어온 action만 처리)
+_ACTIONS = {'ENTRY': execute_entry_trade, 'EXIT': execute_exit_trade}
+
+def _trade_worker():
+    """거래 큐 처리 워커"""
+    while True:
+        data, queued_ns = trade_queue.get()
+        action = data['action'].upper()
+        started_ns = time.perf_counter_ns()
+        try:
+            result = _ACTIONS[action](data)
+            logger.info("거래 처리 완료: %s %s -> %s", action, data.get('symbol'), result.get('status'))
+            logger.info(
+                "지연 시간 [%s] 큐 대기 %.1fms, 실행 %.1fms",
+                action, (started_ns - queued_ns) / 1e6, (time.perf_counter_ns() - started_ns) / 1e6
+            )
+            
+        except Exception as e:
+            logger.error("거래 처리 오류: %s", e)
+            
+            send_telegram_message(functools.partial(_TRADE_ERROR_TEMPLATE.format_map, {
+                'action': action,
+                'symbol': data.get('symbol', ''),
+                'error': e,
+                'time': time.strftime('%H:%M:%S')
+            }))
+
+def _json(obj, status: int = 200) -> Response:
+    """라우트 공용 JSON Response (orjson bytes를 그대로 본문으로 사용)"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
 
 @app.route('/webhook', methods=['POST'])
 def webhook():
     """TradingView 웹훅 수신"""
     try:
-        content_type = request.headers.get('Content-Type', '')
-        
-        if 'application/json' in content_type:
-            data = request.get_json()
-        else:
-            raw_data = request.get_data(as_text=True)
-            try:
-                data = json.loads(raw_data)
-            except json.JSONDecodeError:
-                logger.warning(f"JSON 파싱 실패, raw data: {raw_data[:200]}")
-                data = {'raw_message': raw_data}
-        
-        if not data:
-            return jsonify({'error': 'No data received'}), 400
+        # Content-Type과 무관하게 원본 bytes를 orjson으로 직접 파싱 (str 디코딩 단계 생략)
+        # 본문은 한 번만 읽으므로 요청 객체에 캐시하지 않음
+        raw_data = request.get_data(cache=False)
+        raw_text = None  # JSON이 아닌 본문 미리보기 (사용자 페이로드 dict와 분리해 보관)
+        try:
+            data = orjson.loads(raw_data)
+        except orjson.JSONDecodeError:
+            if request.is_json:  # application/json, application/*+json 선언 시 본문 오류로 처리
+                raise
+            # 파싱 실패 시에만 앞부분만 디코딩 (로그/알림 미리보기 용도)
+            # UTF-8은 문자당 최대 4바이트 → 4배 바이트를 디코딩한 뒤 문자 수로 자르면 한글도 200자, 잘린 문자도 남지 않음
+            raw_text = raw_data[:RAW_MESSAGE_LIMIT * 4].decode('utf-8', errors='replace')[:RAW_MESSAGE_LIMIT]
+            logger.warning("JSON 파싱 실패, raw data: %s", raw_text)
+            data = {}
         
-        logger.info(f"웹훅 수신: {data}")
+        if raw_text is None:
+            if not data:
+                return _json({'error': 'No data received'}, 400)
+            if not isinstance(data, dict):
+                return _json({'error': 'Payload must be a JSON object'}, 400)
+            
+            logger.info("웹훅 수신: %s", data)
         
-        action = data.get('action', '').upper()
+        action = data.get('action')
+        action = action.upper() if isinstance(action, str) else ''
         
-        if action == 'ENTRY':
-            result = execute_entry_trade(data)
-            return jsonify(result), 200 if result['status'] == 'success' else 400
+        if action in _ACTIONS:
+            # 잘못된 신호는 주문/텔레그램 경로에 들어가기 전에 400으로 거절
+            error = _validate_signal(action, data)
+            if error:
+                logger.warning("웹훅 검증 실패 (%s): %s", action, error)
+                return _json({'error': error}, 400)
+            
+            key = _webhook_key(data)
+            cached = _get_recent_webhook(key)
+            if cached is not None:
+                logger.info("중복 웹훅 무시: %s %s", action, data.get('symbol'))
+                return _json(cached[0], cached[1])
+            
+            # 주문은 거래 워커에서 처리하고 TradingView에는 즉시 응답
+            try:
+                trade_queue.put_nowait((data, time.perf_counter_ns()))
+            except queue.Full:
+                logger.error("거래 큐가 가득 차 웹훅을 처리하지 못했습니다: %s %s", action, data.get('symbol'))
+                return _json({'error': 'Trade queue is full'}, 503)
             
-        elif action == 'EXIT':
-            result = execute_exit_trade(data)
-            return jsonify(result), 200
+            result = {'status': 'queued', 'action': action}
+            _remember_webhook(key, result, 202)
+            return _json(result, 202)
             
         else:
-            if 'raw_message' in data:
-                logger.warning(f"알 수 없는 메시지 형식: {data['raw_message'][:100]}")
-                message = f"""⚠️ <b>알 수 없는 웹훅 형식</b>
-
-받은 데이터: {data['raw_message'][:200]}
-
-TradingView Alert 메시지를 JSON 형식으로 설정해주세요:
-{{"action": "ENTRY", "symbol": "BTCUSDT", ...}}"""
-                send_telegram_message(message)
+            if raw_text is not None:
+                logger.warning("알 수 없는 메시지 형식: %s", raw_text[:100])
+                if TELEGRAM_ENABLED and _should_notify_unknown(raw_text):
+                    send_telegram_message(functools.partial(_UNKNOWN_FORMAT_TEMPLATE.format_map, {'preview': raw_text}))
             
-            return jsonify({'error': f'Unknown action: {action}'}), 400
+            return _json({'error': f'Unknown action: {action}'}, 400)
             
+    except orjson.JSONDecodeError as e:
+        # JSON으로 선언된 본문의 형식 오류는 클라이언트 오류 - 텔레그램 알림 없이 400
+        logger.warning("웹훅 JSON 형식 오류: %s", e)
+        return _json({'error': f'Invalid JSON: {e}'}, 400)
+        
     except Exception as e:
-        logger.error(f"웹훅 처리 오류: {str(e)}")
+        logger.error("웹훅 처리 오류: %s", e)
         
-        error_message = f"""❌ <b>웹훅 처리 오류</b>
-
-오류: {str(e)}
-시간: {datetime.now().strftime('%H:%M:%S')}
-
-TradingView Alert 설정을 확인해주세요."""
-        send_telegram_message(error_message)
+        send_telegram_message(functools.partial(_WEBHOOK_ERROR_TEMPLATE.format_map, {
+            'error': e,
+            'time': time.strftime('%H:%M:%S')
+        }))
         
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
+
+@app.route('/telegram', methods=['POST'])
+def telegram_webhook():
+    """텔레그램 봇 명령 수신 (웹훅 모드)"""
+    if not TELEGRAM_WEBHOOK_MODE:
+        return _json({'error': 'Telegram webhook mode is disabled'}, 404)
+    
+    token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+    # bytes로 비교 (str끼리는 비ASCII 헤더 값에서 TypeError → 500)
+    if not hmac.compare_digest(token.encode(), TELEGRAM_WEBHOOK_SECRET.encode()):
+        logger.warning("텔레그램 웹훅 시크릿 불일치 - 요청 무시")
+        return _json({'error': 'Forbidden'}, 403)
+    
+    # 텔레그램은 응답이 늦거나 실패하면 같은 업데이트를 재전송하므로 큐에 넣고 항상 즉시 200 응답
+    try:
+        update = orjson.loads(request.get_data())
+        if _is_new_update(update.get('update_id')):
+            telegram_update_queue.put_nowait(update)
+    except queue.Full:
+        logger.error("텔레그램 업데이트 큐가 가득 차 명령을 무시했습니다")
+    except Exception as e:
+        logger.error("텔레그램 웹훅 처리 오류: %s", e)
+    
+    return _json({'ok': True})
 
 @app.route('/test', methods=['GET'])
 def test_connection():
     """연결 테스트"""
     try:
-        bitget = BitgetFuturesClient()
-        balance = bitget.get_available_balance()
+        bitget = bitget_client
+        balance = bitget.get_available_balance(max_age=TEST_BALANCE_CACHE_TTL)
         
-        message = f"""🧪 <b>시스템 테스트</b>
-
-✅ 서버: 정상
-✅ Bitget API: 연결됨
-💰 잔고: {balance:,.2f} USDT
-📊 손실 비율: {LOSS_RATIO}%
-🎰 최대 레버리지: {MAX_LEVERAGE}x
-
-텔레그램 명령어:
-/S - 상태 및 통계 조회
-/R - 통계 초기화
-/M - Bitget 서버 상태 확인"""
+        # 테스트 엔드포인트는 텔레그램 전달 여부까지 확인하므로 큐를 거치지 않고 직접 전송
+        telegram_ok = send_telegram_message_sync(_SYSTEM_TEST_TEMPLATE.format(balance=balance))
         
-        send_telegram_message(message)
-        
-        return jsonify({
+        return _json({
             'status': 'success',
-            'balance': balance
+            'balance': balance,
+            'telegram': telegram_ok
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
+
+def _warm_up_connections():
+    """시작 시 Bitget 공개 API를 한 번 호출해 DNS 조회와 TCP/TLS 연결을 미리 수행 (첫 웹훅 지연 감소)"""
+    try:
+        BITGET_SESSION.get(BITGET_TIME_URL, timeout=5)
+        logger.info("Bitget 연결 준비 완료")
+    except Exception as e:
+        logger.warning("Bitget 연결 준비 실패: %s", e)
+
+def start_background_workers():
+    """백그라운드 스레드 시작 (wsgi.py / 로컬 실행 공용)"""
+    # 서명(HMAC-SHA256)은 hashlib.sha256 → OpenSSL 구현 사용 (CPU의 SHA 확장 명령은 OpenSSL이 자동 선택)
+    logger.info("암호화 백엔드: %s", ssl.OPENSSL_VERSION)
+    # 텔레그램 전송 워커 시작
+    threading.Thread(target=_telegram_worker, daemon=True).start()
+    # Bitget 커넥션 풀 예열 (폴링/웹훅 모드와 무관)
+    io_pool.submit(_warm_up_connections)
+    # 거래 실행 워커 시작
+    for _ in range(TRADE_WORKERS):
+        threading.Thread(target=_trade_worker, daemon=True).start()
+    # 통계 파일 플러셔 시작
+    threading.Thread(target=stats.run_flusher, daemon=True).start()
+    
+    # 텔레그램 봇: 웹훅 URL이 설정되어 있으면 웹훅 등록, 아니면 폴링 스레드 시작
+    if not TELEGRAM_ENABLED:
+        logger.warning("TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID 미설정 - 텔레그램 알림과 봇 명령을 사용하지 않습니다")
+    elif TELEGRAM_WEBHOOK_MODE:
+        threading.Thread(target=_telegram_update_worker, daemon=True).start()
+        threading.Thread(target=register_telegram_webhook, daemon=True).start()
+    else:
+        if TELEGRAM_WEBHOOK_URL:
+            logger.error("TELEGRAM_WEBHOOK_SECRET 미설정 - 웹훅 모드를 사용하지 않고 폴링으로 동작합니다")
+        bot_thread = threading.Thread(target=telegram_bot_polling, daemon=True)
+        bot_thread.start()
 
 if __name__ == '__main__':
-    # 텔레그램 봇 폴링 스레드 시작
-    import threading
-    bot_thread = threading.Thread(target=telegram_bot_polling, daemon=True)
-    bot_thread.start()
+    # 로컬 개발용 실행 - 운영 환경은 Procfile의 gunicorn(gevent) + wsgi.py 사용
+    start_background_workers()
     
     # Flask 서버 시작
     port = int(os.environ.get('PORT', 5000))
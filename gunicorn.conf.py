@@ -0,0 +1,13 @@
+# Gunicorn 설정 (Procfile: gunicorn -c gunicorn.conf.py wsgi:application)
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# 포지션/통계 상태와 텔레그램 폴링이 프로세스 메모리에 있으므로 워커는 반드시 1개
+# 동시 웹훅은 gevent 그린렛으로 처리 (Bitget/텔레그램 대기 중 다른 요청 처리)
+workers = 1
+worker_class = 'gevent'
+worker_connections = 1000
+
+timeout = 30
+keepalive = 75  # TradingView/프록시 연결 재사용
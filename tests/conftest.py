@@ -0,0 +1,20 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    # app은 import 시 로그/통계 파일을 현재 디렉터리 기준으로 사용하므로 임시 디렉터리에서 import
+    workdir = tmp_path_factory.mktemp('app')
+    mp = pytest.MonkeyPatch()
+    mp.chdir(workdir)
+    mp.syspath_prepend(str(ROOT))
+    module = importlib.import_module('app')
+    yield module
+    mp.undo()
+    sys.modules.pop('app', None)
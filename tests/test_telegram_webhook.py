@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'TELEGRAM_WEBHOOK_MODE', True)
+    monkeypatch.setattr(app_module, 'TELEGRAM_WEBHOOK_SECRET', 's3cret')
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize('token', ['wrong', 'é漢字'])
+def test_bad_secret_is_forbidden(client, token):
+    response = client.post('/telegram', json={'update_id': 1},
+                           headers={'X-Telegram-Bot-Api-Secret-Token': token})
+    assert response.status_code == 403
+
+
+def test_disabled_without_webhook_mode(client, monkeypatch, app_module):
+    monkeypatch.setattr(app_module, 'TELEGRAM_WEBHOOK_MODE', False)
+    response = client.post('/telegram', json={'update_id': 1},
+                           headers={'X-Telegram-Bot-Api-Secret-Token': 's3cret'})
+    assert response.status_code == 404
@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.mark.parametrize('payload', [
+    {'action': 'ENTRY', 'symbol': 'BTCUSDT', 'price': 100, 'sl': 95},
+    {'action': 'ENTRY', 'symbol': 'BTCUSDT', 'price': 100, 'tp': None, 'sl': None},
+])
+def test_entry_tp_sl_are_optional(app_module, payload):
+    assert app_module._validate_signal('ENTRY', payload) is None
+
+
+@pytest.mark.parametrize('value', ['inf', '1e400', 'nan', -1, 'abc', True])
+def test_entry_price_must_be_positive_finite_number(app_module, value):
+    payload = {'action': 'ENTRY', 'symbol': 'BTCUSDT', 'price': value}
+    assert app_module._validate_signal('ENTRY', payload) is not None
+
+
+def test_exit_result_must_be_string(app_module):
+    payload = {'action': 'EXIT', 'symbol': 'BTCUSDT', 'exit_price': 100, 'result': 1}
+    assert app_module._validate_signal('EXIT', payload) == "result must be a string"
+    payload['result'] = 'PROFIT'
+    assert app_module._validate_signal('EXIT', payload) is None
+
+
+def test_entry_with_null_tp_sl_places_order_without_presets(app_module, monkeypatch):
+    client = app_module.bitget_client
+    orders = []
+    monkeypatch.setattr(client, 'get_positions', lambda symbol=None, max_age=0: [])
+    monkeypatch.setattr(client, 'get_available_balance', lambda max_age=0: 1000.0)
+    monkeypatch.setattr(client, 'set_leverage', lambda **kwargs: {})
+    monkeypatch.setattr(client, 'place_limit_order', lambda **kwargs: orders.append(kwargs) or 'OID1')
+    monkeypatch.setattr(app_module, 'send_telegram_message', lambda message: True)
+    monkeypatch.setattr(app_module, '_save_position', lambda: None)
+
+    result = app_module.execute_entry_trade(
+        {'action': 'ENTRY', 'symbol': 'BTCUSDT', 'price': 100, 'tp': None, 'sl': None}
+    )
+
+    assert result['status'] == 'success'
+    assert orders[0]['leverage'] == 1
+    assert not orders[0]['tp_price'] and not orders[0]['sl_price']
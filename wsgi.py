@@ -0,0 +1,10 @@
+# gevent 워커에서 requests/threading이 협력적으로 동작하도록 다른 import보다 먼저 패치
+from gevent import monkey
+monkey.patch_all()
+
+from app import app, start_background_workers
+
+# 텔레그램 봇 폴링 등 백그라운드 작업은 워커 프로세스 안에서 시작
+start_background_workers()
+
+application = app